@@ -2,6 +2,7 @@
 
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 from ragnarbot.providers.reasoning import SUPPORTED_REASONING_LEVELS
@@ -10,7 +11,22 @@ BUILTIN_AGENTS_DIR = Path(__file__).parent.parent / "agents"
 SUPPORTED_AGENT_REASONING_LEVELS = {"inherit", *SUPPORTED_REASONING_LEVELS}
 
 
-@dataclass
+@lru_cache(maxsize=1)
+def _builtin_agent_names() -> frozenset[str]:
+    """Names of the packaged built-in agents (scanned once; they ship with the package)."""
+    if not BUILTIN_AGENTS_DIR.is_dir():
+        return frozenset()
+    return frozenset(
+        d.name for d in BUILTIN_AGENTS_DIR.iterdir() if (d / "AGENT.md").is_file()
+    )
+
+
+def builtin_agent_exists(name: str) -> bool:
+    """Check whether a packaged built-in agent exists."""
+    return name in _builtin_agent_names()
+
+
+@dataclass(slots=True, frozen=True)
 class AgentDefinition:
     """Parsed agent definition from an AGENT.md file."""
 
@@ -35,6 +51,19 @@ class AgentsLoader:
     def __init__(self, workspace: Path, builtin_agents_dir: Path | None = None):
         self.workspace_agents = workspace / "agents"
         self.builtin_agents = builtin_agents_dir or BUILTIN_AGENTS_DIR
+        self._agent_texts: dict[str, str] | None = None
+
+    @classmethod
+    def from_mapping(cls, agents: dict[str, str]) -> "AgentsLoader":
+        """
+        Build a loader over in-memory AGENT.md texts, without touching disk.
+
+        Args:
+            agents: Mapping of agent name to raw AGENT.md content.
+        """
+        loader = cls(Path("<memory>"))
+        loader._agent_texts = dict(agents)
+        return loader
 
     def list_agents(self) -> list[dict[str, str]]:
         """
@@ -43,6 +72,17 @@ class AgentsLoader:
         Returns:
             List of dicts with name, description, path, source.
         """
+        if self._agent_texts is not None:
+            return [
+                {
+                    "name": name,
+                    "description": self._parse_frontmatter(text).get("description", name),
+                    "path": self._memory_path(name),
+                    "source": "memory",
+                }
+                for name, text in sorted(self._agent_texts.items())
+            ]
+
         agents: list[dict[str, str]] = []
         seen: set[str] = set()
 
@@ -89,6 +129,12 @@ class AgentsLoader:
         Returns:
             AgentDefinition or None if not found.
         """
+        if self._agent_texts is not None:
+            text = self._agent_texts.get(name)
+            if text is None:
+                return None
+            return self._parse_agent_text(text, name, self._memory_path(name))
+
         # Check workspace first
         workspace_file = self.workspace_agents / name / "AGENT.md"
         if workspace_file.exists():
@@ -97,7 +143,7 @@ class AgentsLoader:
         # Check built-in
         if self.builtin_agents:
             builtin_file = self.builtin_agents / name / "AGENT.md"
-            if builtin_file.exists():
+            if self._builtin_file_exists(name, builtin_file):
                 return self._parse_agent(builtin_file)
 
         return None
@@ -126,9 +172,23 @@ class AgentsLoader:
 
         return "\n".join(lines)
 
+    def _builtin_file_exists(self, name: str, builtin_file: Path) -> bool:
+        """Check a builtin AGENT.md, using the cached probe for the packaged dir."""
+        if self.builtin_agents == BUILTIN_AGENTS_DIR:
+            return builtin_agent_exists(name)
+        return builtin_file.exists()
+
+    @staticmethod
+    def _memory_path(name: str) -> str:
+        return f"<memory>/{name}/AGENT.md"
+
     def _parse_agent(self, path: Path) -> AgentDefinition:
         """Parse an AGENT.md file into an AgentDefinition."""
         content = path.read_text(encoding="utf-8")
+        return self._parse_agent_text(content, path.parent.name, str(path))
+
+    def _parse_agent_text(self, content: str, dir_name: str, path: str) -> AgentDefinition:
+        """Parse AGENT.md content into an AgentDefinition."""
         meta = self._parse_frontmatter(content)
         body = self._strip_frontmatter(content)
 
@@ -158,13 +218,13 @@ class AgentsLoader:
             reasoning_level = "inherit"
 
         return AgentDefinition(
-            name=meta.get("name", path.parent.name),
+            name=meta.get("name", dir_name),
             description=meta.get("description", ""),
             model=meta.get("model", "default"),
             allowed_tools=allowed_tools,
             allowed_skills=allowed_skills,
             body=body,
-            path=str(path),
+            path=path,
             reasoning_level=reasoning_level,
         )
 
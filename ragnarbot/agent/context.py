@@ -200,18 +200,32 @@ Use `agent_spawn` to start a task with a specific agent type, or omit the agent
 
     def _load_builtin_cron_isolated(self, cron_ctx: dict) -> str:
         """Load the cron isolated mode system prompt with placeholders."""
-        import time as _time
+        parts = [self._load_builtin_cron_rules(), self._load_builtin_cron_run(cron_ctx)]
+        return "\n\n".join(p for p in parts if p)
+
+    def _load_builtin_cron_rules(self) -> str:
+        """Load the cron rules, which only depend on the workspace."""
         file_path = BUILTIN_DIR / "CRON_ISOLATED.md"
         if not file_path.exists():
             return ""
         content = file_path.read_text(encoding="utf-8")
+        return content.format(
+            workspace_path=str(self.workspace.expanduser().resolve()),
+        ).strip()
+
+    def _load_builtin_cron_run(self, cron_ctx: dict) -> str:
+        """Load the per-run cron details (job, schedule, time, task)."""
+        import time as _time
+        file_path = BUILTIN_DIR / "CRON_ISOLATED_RUN.md"
+        if not file_path.exists():
+            return ""
+        content = file_path.read_text(encoding="utf-8")
         return content.format(
             job_name=cron_ctx.get("job_name", "Unknown"),
             schedule_desc=cron_ctx.get("schedule_desc", "Unknown"),
             current_time=_time.strftime("%Y-%m-%d %H:%M:%S %Z"),
             task_message=cron_ctx.get("task_message", ""),
-            workspace_path=str(self.workspace.expanduser().resolve()),
-        )
+        ).strip()
 
     def _load_builtin_heartbeat_isolated(self, hb_ctx: dict) -> str:
         """Load the heartbeat isolated mode system prompt with placeholders."""
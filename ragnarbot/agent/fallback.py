@@ -11,7 +11,7 @@ def _state_file():
     return ensure_instance_root().fallback_state_path
 
 
-@dataclass
+@dataclass(slots=True)
 class FallbackState:
     """Tracks primary/fallback provider state for automatic failover."""
 
@@ -3298,17 +3298,18 @@ class AgentLoop:
         # Build full registry first, then keep only allowed tools + deliver_result
         full_reg, deliver_tool = self._build_isolated_tool_registry(channel, chat_id)
 
-        allowed = set(definition.allowed_tools) if isinstance(
-            definition.allowed_tools, list
-        ) else {definition.allowed_tools}
+        allowed_tools = definition.allowed_tools
+        allowed = frozenset(
+            allowed_tools if isinstance(allowed_tools, list) else (allowed_tools,)
+        ) | {"deliver_result"}
 
         # Auto-add file_read when skills are allowed (needed to load SKILL.md)
         if definition.allowed_skills != "none":
-            allowed.add("file_read")
+            allowed |= {"file_read"}
 
         filtered_reg = ToolRegistry()
-        for tool in full_reg._tools.values():
-            if tool.name in allowed or tool.name == "deliver_result":
+        for name, tool in full_reg._tools.items():
+            if name in allowed:
                 filtered_reg.register(tool)
 
         # Ensure deliver_result is always present
@@ -3326,17 +3327,20 @@ class AgentLoop:
     ) -> list[dict]:
         """Build messages for a cron job running with an agent profile.
 
-        Combines the CRON_ISOLATED.md rules with the AGENT.md body into
-        a single system prompt.
+        The system prompt is sent as three system messages, most stable
+        first, so providers with prefix caching can reuse the leading ones:
+        the CRON_ISOLATED.md rules (shared by every cron agent), the AGENT.md
+        instructions with skills (shared by runs of the same agent), then the
+        per-run job details and task.
         """
 
         cron_ctx = session_metadata["cron_isolated"]
 
-        # Load CRON_ISOLATED.md rules
-        cron_rules = self.context._load_builtin_cron_isolated(cron_ctx)
+        # Tier 1: cron rules, identical for every cron agent
+        cron_rules = self.context._load_builtin_cron_rules()
 
-        # Build combined system prompt: cron rules + agent instructions
-        parts = [cron_rules, "---", f"# Agent Instructions\n\n{definition.body}"]
+        # Tier 2: agent instructions, identical across runs of this agent
+        parts = ["---", f"# Agent Instructions\n\n{definition.body}"]
         model_behavior_addendum = get_model_behavior_addendum(resolved_model)
         if model_behavior_addendum:
             parts.append("---\n\n" + model_behavior_addendum)
@@ -3356,10 +3360,13 @@ class AgentLoop:
                     + summary
                 )
 
-        system_prompt = "\n\n".join(parts)
+        # Tier 3: job, schedule, current time and task for this run
+        cron_run = self.context._load_builtin_cron_run(cron_ctx)
 
         return [
-            {"role": "system", "content": system_prompt},
+            {"role": "system", "content": cron_rules},
+            {"role": "system", "content": "\n\n".join(parts)},
+            {"role": "system", "content": f"---\n\n{cron_run}"},
             {"role": "user", "content": message},
         ]
 
@@ -22,12 +22,12 @@ from ragnarbot.providers.base import LLMProvider
 BUILTIN_DIR = Path(__file__).parent.parent / "builtin"
 
 # Tools that are safe for sub-agents
-SAFE_TOOL_NAMES = {
+SAFE_TOOL_NAMES: frozenset[str] = frozenset({
     "file_read", "file_write", "file_edit", "list_dir",
     "grep", "glob",
     "exec", "web_search", "web_fetch", "browser",
     "exec_bg", "poll", "output", "kill", "dismiss",
-}
+})
 
 
 class AgentTaskStatus(str, Enum):
@@ -572,8 +572,7 @@ class SubagentManager:
 
         # Auto-add file_read when skills are allowed (needed to load SKILL.md)
         if definition and definition.allowed_skills != "none":
-            allowed = set(allowed)  # ensure mutable copy
-            allowed.add("file_read")
+            allowed = allowed | {"file_read"}
 
         # File tools
         if "file_read" in allowed:
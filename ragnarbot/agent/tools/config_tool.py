@@ -3,12 +3,24 @@
 from __future__ import annotations
 
 import json
-from typing import TYPE_CHECKING, Any
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Any, Callable
 
 from ragnarbot.agent.tools.base import Tool
 
 if TYPE_CHECKING:
     from ragnarbot.agent.loop import AgentLoop
+    from ragnarbot.auth.credentials import Credentials
+    from ragnarbot.config.schema import Config
+
+
+def _paths_with_prefix(sorted_paths: list[str], prefix: str) -> list[str]:
+    """Return the contiguous run of ``sorted_paths`` starting with ``prefix``."""
+    start = bisect_left(sorted_paths, prefix)
+    end = start
+    while end < len(sorted_paths) and sorted_paths[end].startswith(prefix):
+        end += 1
+    return sorted_paths[start:end]
 
 
 class ConfigTool(Tool):
@@ -45,8 +57,31 @@ class ConfigTool(Tool):
         "required": ["action"],
     }
 
-    def __init__(self, agent: AgentLoop):
+    def __init__(
+        self,
+        agent: AgentLoop,
+        config_source: Callable[[], Config] | None = None,
+        creds_source: Callable[[], Credentials] | None = None,
+    ):
         self._agent = agent
+        self._config_source = config_source
+        self._creds_source = creds_source
+
+    def _load_config(self) -> Config:
+        """Load the config via the injected source, or from disk."""
+        if self._config_source is not None:
+            return self._config_source()
+        from ragnarbot.config.loader import load_config_cached
+
+        return load_config_cached()
+
+    def _load_credentials(self) -> Credentials:
+        """Load credentials via the injected source, or from disk."""
+        if self._creds_source is not None:
+            return self._creds_source()
+        from ragnarbot.auth.credentials import load_credentials
+
+        return load_credentials()
 
     async def execute(
         self,
@@ -69,28 +104,28 @@ class ConfigTool(Tool):
 
     def _action_schema(self, path: str | None) -> str:
         from ragnarbot.agent.tools.secrets_helpers import secrets_schema
-        from ragnarbot.auth.credentials import load_credentials
-        from ragnarbot.config.loader import load_config
         from ragnarbot.config.path_utils import get_all_paths, get_field_meta
         from ragnarbot.config.schema import Config
 
         # Secrets-only schema
         if path and path.startswith("secrets"):
-            creds = load_credentials()
+            creds = self._load_credentials()
             filter_path = path if path != "secrets" else None
             return secrets_schema(creds, filter_path)
 
         from ragnarbot.config.providers import PROVIDERS
 
-        config = load_config()
+        config = self._load_config()
         all_paths = get_all_paths(config)
         model_fields = {"agents.defaults.model", "agents.fallback.model"}
         all_model_ids = [m["id"] for p in PROVIDERS for m in p["models"]]
 
+        paths = sorted(all_paths)
+        if path:
+            paths = _paths_with_prefix(paths, path)
+
         lines = []
-        for p in sorted(all_paths.keys()):
-            if path and not p.startswith(path):
-                continue
+        for p in paths:
             try:
                 meta = get_field_meta(Config, p)
                 reload_tag = f" [{meta['reload']}]" if meta.get("reload") else ""
@@ -109,7 +144,7 @@ class ConfigTool(Tool):
 
         # Append secrets schema when no path filter
         if not path:
-            creds = load_credentials()
+            creds = self._load_credentials()
             sec = secrets_schema(creds)
             if sec:
                 lines.append("")
@@ -125,17 +160,15 @@ class ConfigTool(Tool):
 
         if path.startswith("secrets."):
             from ragnarbot.agent.tools.secrets_helpers import secrets_get
-            from ragnarbot.auth.credentials import load_credentials
 
-            creds = load_credentials()
+            creds = self._load_credentials()
             return secrets_get(creds, path[8:])
 
-        from ragnarbot.config.loader import load_config
         from ragnarbot.config.path_utils import get_by_path, get_field_meta
         from ragnarbot.config.schema import Config
 
         try:
-            config = load_config()
+            config = self._load_config()
             value = get_by_path(config, path)
             meta = get_field_meta(Config, path)
             return json.dumps({
@@ -156,21 +189,21 @@ class ConfigTool(Tool):
 
         if path.startswith("secrets."):
             from ragnarbot.agent.tools.secrets_helpers import secrets_set
-            from ragnarbot.auth.credentials import load_credentials, save_credentials
+            from ragnarbot.auth.credentials import save_credentials
 
-            creds = load_credentials()
+            creds = self._load_credentials()
             creds, result_str = secrets_set(creds, path[8:], value)
             if not result_str.startswith("Error"):
                 save_credentials(creds)
             return result_str
 
         from ragnarbot.agent.tools.secrets_helpers import check_config_dependency
-        from ragnarbot.config.loader import load_config, save_config
+        from ragnarbot.config.loader import save_config
         from ragnarbot.config.path_utils import get_by_path, get_field_meta, set_by_path
         from ragnarbot.config.schema import Config
 
         try:
-            config = load_config()
+            config = self._load_config()
             old_value = get_by_path(config, path)
             set_by_path(config, path, value)
             new_value = get_by_path(config, path)
@@ -210,7 +243,9 @@ class ConfigTool(Tool):
 
             if path == "agents.fallback.model" and new_value:
                 fb_auth = config.agents.fallback.auth_method
-                error = validate_model_auth(new_value, fb_auth)
+                error = validate_model_auth(
+                    new_value, fb_auth, creds=self._load_credentials(),
+                )
                 if error:
                     set_by_path(config, path, old_value)
                     return f"Error: {error}"
@@ -218,7 +253,9 @@ class ConfigTool(Tool):
             if path == "agents.fallback.auth_method":
                 fb_model = config.agents.fallback.model
                 if fb_model:
-                    error = validate_model_auth(fb_model, new_value)
+                    error = validate_model_auth(
+                        fb_model, new_value, creds=self._load_credentials(),
+                    )
                     if error:
                         set_by_path(config, path, old_value)
                         return f"Error: {error}"
@@ -226,20 +263,26 @@ class ConfigTool(Tool):
             if path == "agents.defaults.auth_method":
                 defaults_model = config.agents.defaults.model
                 if defaults_model:
-                    error = validate_model_auth(defaults_model, new_value)
+                    error = validate_model_auth(
+                        defaults_model, new_value, creds=self._load_credentials(),
+                    )
                     if error:
                         set_by_path(config, path, old_value)
                         return f"Error: {error}"
 
             if path == "agents.defaults.model" and new_value:
                 defaults_auth = config.agents.defaults.auth_method
-                error = validate_model_auth(new_value, defaults_auth)
+                error = validate_model_auth(
+                    new_value, defaults_auth, creds=self._load_credentials(),
+                )
                 if error:
                     set_by_path(config, path, old_value)
                     return f"Error: {error}"
 
             # Check credential dependencies before persisting
-            dep_error = check_config_dependency(path, str(new_value))
+            dep_error = check_config_dependency(
+                path, str(new_value), creds=self._load_credentials(),
+            )
             if dep_error:
                 # Rollback: restore old value
                 set_by_path(config, path, old_value)
@@ -277,15 +320,13 @@ class ConfigTool(Tool):
 
     def _action_list(self) -> str:
         from ragnarbot.agent.tools.secrets_helpers import secrets_list
-        from ragnarbot.auth.credentials import load_credentials
-        from ragnarbot.config.loader import load_config
         from ragnarbot.config.path_utils import get_all_paths
 
-        config = load_config()
+        config = self._load_config()
         all_paths = get_all_paths(config)
         lines = [f"{p} = {v!r}" for p, v in sorted(all_paths.items())]
 
-        creds = load_credentials()
+        creds = self._load_credentials()
         sec = secrets_list(creds)
         if sec:
             lines.append("")
@@ -294,12 +335,11 @@ class ConfigTool(Tool):
         return "\n".join(lines)
 
     def _action_diff(self) -> str:
-        from ragnarbot.config.loader import load_config
         from ragnarbot.config.path_utils import get_all_paths
-        from ragnarbot.config.schema import Config
+        from ragnarbot.config.schema import default_config
 
-        current = load_config()
-        defaults = Config()
+        current = self._load_config()
+        defaults = default_config()
         current_paths = get_all_paths(current)
         default_paths = get_all_paths(defaults)
 
@@ -425,20 +465,18 @@ class ConfigTool(Tool):
 
     def _apply_warm_reload(self, path: str, value: Any) -> str | None:
         """Apply warm-reloadable fallback config changes without restart."""
-        from ragnarbot.config.loader import load_config
-
         agent = self._agent
 
         switch = getattr(agent, "switch_model", None)
 
         if path == "agents.defaults.model" and callable(switch):
-            auth_method = load_config().agents.defaults.auth_method
+            auth_method = self._load_config().agents.defaults.auth_method
             if switch(str(value), auth_method) is None:
                 return f"Model switched to {value} — active now."
             return None  # fall back to "restart required"
 
         if path == "agents.defaults.auth_method" and callable(switch):
-            model = load_config().agents.defaults.model
+            model = self._load_config().agents.defaults.model
             if switch(model, str(value)) is None:
                 return f"Auth method switched to {value} — active now."
             return None
@@ -471,9 +509,8 @@ class ConfigTool(Tool):
     def _reload_web_search(self) -> str:
         """Re-register WebSearchTool with current config values."""
         from ragnarbot.agent.tools.web import WebSearchTool
-        from ragnarbot.config.loader import load_config
 
-        config = load_config()
+        config = self._load_config()
         agent = self._agent
 
         agent.tools.unregister("web_search")
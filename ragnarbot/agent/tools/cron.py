@@ -1,11 +1,10 @@
 """Cron tool for scheduling reminders and tasks."""
 
 import datetime
-from datetime import timedelta
 from typing import Any
 
 from ragnarbot.agent.tools.base import Tool
-from ragnarbot.cron.service import CronService, _detect_timezone
+from ragnarbot.cron.service import CronService, _detect_timezone, _now_ms
 from ragnarbot.cron.types import CronSchedule
 
 
@@ -148,18 +147,19 @@ class CronTool(Tool):
                 dt = datetime.datetime.fromisoformat(at)
             except ValueError:
                 return f"Error: invalid ISO datetime: {at}"
-            now = datetime.datetime.now(dt.tzinfo)
-            if dt <= now:
+            at_ms = int(dt.timestamp() * 1000)
+            now_ms = _now_ms()
+            if at_ms <= now_ms:
+                now = datetime.datetime.fromtimestamp(now_ms / 1000, dt.tzinfo)
                 return (
                     f"Error: scheduled time is in the past "
                     f"({at} <= {now.isoformat()}). Use 'after' for relative delays."
                 )
-            schedule = CronSchedule(kind="at", at_ms=int(dt.timestamp() * 1000))
+            schedule = CronSchedule(kind="at", at_ms=at_ms)
         elif after is not None:
             if after < 10:
                 return "Error: 'after' must be at least 10 seconds"
-            run_at = datetime.datetime.now() + timedelta(seconds=after)
-            schedule = CronSchedule(kind="at", at_ms=int(run_at.timestamp() * 1000))
+            schedule = CronSchedule(kind="at", at_ms=_now_ms() + int(after * 1000))
         elif every_seconds:
             schedule = CronSchedule(kind="every", every_ms=every_seconds * 1000)
         elif cron_expr:
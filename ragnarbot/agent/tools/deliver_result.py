@@ -8,33 +8,26 @@ from ragnarbot.agent.tools.base import Tool
 class DeliverResultTool(Tool):
     """Tool that captures output from isolated cron jobs."""
 
+    name = "deliver_result"
+    description = (
+        "Deliver the final result of a cron job to the user. "
+        "This is the ONLY way the user sees your output in isolated mode."
+    )
+
+    parameters = {
+        "type": "object",
+        "properties": {
+            "content": {
+                "type": "string",
+                "description": "The result content to deliver to the user",
+            },
+        },
+        "required": ["content"],
+    }
+
     def __init__(self):
         self._result: str | None = None
 
-    @property
-    def name(self) -> str:
-        return "deliver_result"
-
-    @property
-    def description(self) -> str:
-        return (
-            "Deliver the final result of a cron job to the user. "
-            "This is the ONLY way the user sees your output in isolated mode."
-        )
-
-    @property
-    def parameters(self) -> dict[str, Any]:
-        return {
-            "type": "object",
-            "properties": {
-                "content": {
-                    "type": "string",
-                    "description": "The result content to deliver to the user",
-                },
-            },
-            "required": ["content"],
-        }
-
     async def execute(self, content: str = "", **kwargs: Any) -> str:
         self._result = content
         return "Result captured."
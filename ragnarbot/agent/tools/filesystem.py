@@ -1,6 +1,5 @@
 """File system tools: read, write, edit."""
 
-import base64
 import difflib
 import mimetypes
 import re
@@ -9,6 +8,7 @@ from typing import Any
 
 from ragnarbot.agent.pathing import resolve_path_in_workspace
 from ragnarbot.agent.tools.base import Tool
+from ragnarbot.utils.helpers import encode_base64
 
 EDIT_DIFF_MAX_CHARS = 4_000  # only attach a unified diff to edit results below this size
 
@@ -225,7 +225,7 @@ class ReadFileTool(Tool):
 
         mime, _ = mimetypes.guess_type(str(file_path))
         mime = mime or "image/jpeg"
-        b64 = base64.b64encode(file_path.read_bytes()).decode()
+        b64 = encode_base64(file_path.read_bytes())
         size_kb = size / 1024
 
         return [
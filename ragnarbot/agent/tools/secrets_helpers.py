@@ -63,12 +63,16 @@ CONFIG_DEPENDENCIES = [
 ]
 
 
-def check_config_dependency(config_path: str, new_value: str) -> str | None:
+def check_config_dependency(
+    config_path: str, new_value: str, creds: Credentials | None = None,
+) -> str | None:
     """Check if a config change requires credentials that aren't set.
 
+    Credentials are loaded from disk unless ``creds`` is given.
     Returns an error message if a required credential is missing, None if OK.
     """
-    creds = load_credentials()
+    if creds is None:
+        creds = load_credentials()
     str_value = str(new_value)
 
     for dep in CONFIG_DEPENDENCIES:
@@ -10,6 +10,17 @@ from ragnarbot.agent.pathing import resolve_working_dir
 from ragnarbot.agent.processes import isolated_process_kwargs, terminate_process_tree
 from ragnarbot.agent.tools.base import Tool
 
+_DENY_PATTERNS = (
+    r"\brm\s+-[rf]{1,2}\b",                               # rm -r, rm -rf, rm -fr
+    r"\bdel\s+/[fq]\b",                                   # del /f, del /q
+    r"\brmdir\s+/s\b",                                    # rmdir /s
+    r"(?:^|[|;&]\s*)(?:sudo\s+)?(format|mkfs|diskpart)\b",  # disk operations
+    r"\bdd\s+if=",                                        # dd
+    r">\s*/dev/sd",                                       # write to disk
+    r"(?:^|[|;&]\s*)(?:sudo\s+)?(shutdown|reboot|poweroff)\b",  # system power
+    r":\(\)\s*\{.*\};\s*:",                               # fork bomb
+)
+
 
 class ExecTool(Tool):
     """Tool to execute shell commands."""
@@ -26,16 +37,7 @@ class ExecTool(Tool):
         self.timeout = timeout
         self.working_dir = working_dir
         self.safety_guard = safety_guard
-        self.deny_patterns = deny_patterns or [
-            r"\brm\s+-[rf]{1,2}\b",                               # rm -r, rm -rf, rm -fr
-            r"\bdel\s+/[fq]\b",                                   # del /f, del /q
-            r"\brmdir\s+/s\b",                                    # rmdir /s
-            r"(?:^|[|;&]\s*)(?:sudo\s+)?(format|mkfs|diskpart)\b",  # disk operations
-            r"\bdd\s+if=",                                        # dd
-            r">\s*/dev/sd",                                       # write to disk
-            r"(?:^|[|;&]\s*)(?:sudo\s+)?(shutdown|reboot|poweroff)\b",  # system power
-            r":\(\)\s*\{.*\};\s*:",                               # fork bomb
-        ]
+        self.deny_patterns = deny_patterns or list(_DENY_PATTERNS)
         self.allow_patterns = allow_patterns or []
         self.restrict_to_workspace = restrict_to_workspace
 
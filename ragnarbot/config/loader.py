@@ -1,6 +1,7 @@
 """Configuration loading utilities."""
 
 import json
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -51,6 +52,29 @@ def load_config(config_path: Path | None = None) -> Config:
     return config
 
 
+@lru_cache(maxsize=1)
+def _load_config_for(path: str, mtime_ns: int, size: int) -> Config:
+    # path/mtime/size only key the cache; load_config() resolves the path itself.
+    return load_config()
+
+
+def load_config_cached() -> Config:
+    """
+    Load the active profile's config, reusing the last parse while the
+    file is unchanged.
+
+    The cache is keyed on the file's mtime and size, so edits from other
+    processes are picked up, and save_config() clears it. Callers get a
+    deep copy they are free to mutate.
+    """
+    path = get_config_path()
+    try:
+        st = path.stat()
+    except OSError:
+        return load_config()
+    return _load_config_for(str(path), st.st_mtime_ns, st.st_size).model_copy(deep=True)
+
+
 def save_config(config: Config, config_path: Path | None = None) -> None:
     """
     Save configuration to file.
@@ -68,6 +92,7 @@ def save_config(config: Config, config_path: Path | None = None) -> None:
 
     with open(path, "w") as f:
         json.dump(data, f, indent=2)
+    _load_config_for.cache_clear()
 
 
 def convert_keys(data: Any) -> Any:
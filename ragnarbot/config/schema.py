@@ -1,11 +1,17 @@
 """Configuration schema using Pydantic."""
 
+import os
+from functools import lru_cache
 from pathlib import Path
 
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings
 
-from ragnarbot.instance import resolve_workspace_path, workspace_config_value
+from ragnarbot.instance import (
+    resolve_active_profile,
+    resolve_workspace_path,
+    workspace_config_value,
+)
 
 
 class TelegramConfig(BaseModel):
@@ -395,3 +401,22 @@ class Config(BaseSettings):
     class Config:
         env_prefix = "RAGNARBOT_"
         env_nested_delimiter = "__"
+
+
+@lru_cache(maxsize=8)
+def _default_config_for(profile: str, env: tuple[tuple[str, str], ...]) -> Config:
+    # ``env`` is only part of the cache key: Config reads RAGNARBOT_* itself.
+    return Config()
+
+
+def default_config() -> Config:
+    """Return a fresh default Config for the active profile.
+
+    Building a Config validates the whole schema and reads RAGNARBOT_*
+    overrides, so one instance is cached per profile and environment and
+    each caller gets a deep copy it is free to mutate.
+    """
+    env = tuple(sorted(
+        (k, v) for k, v in os.environ.items() if k.upper().startswith("RAGNARBOT_")
+    ))
+    return _default_config_for(resolve_active_profile(), env).model_copy(deep=True)
@@ -13,6 +13,12 @@ from ragnarbot.daemon.resolve import (
     service_cli_args,
 )
 
+# Profile-independent plist keys; install() adds the per-profile ones
+_PLIST_TEMPLATE = {
+    "RunAtLoad": True,
+    "KeepAlive": True,
+}
+
 
 class LaunchdManager(DaemonManager):
 
@@ -27,10 +33,9 @@ class LaunchdManager(DaemonManager):
         label = get_launchd_label()
 
         plist = {
+            **_PLIST_TEMPLATE,
             "Label": label,
             "ProgramArguments": [*exe, *service_cli_args()],
-            "RunAtLoad": True,
-            "KeepAlive": True,
             "StandardOutPath": str(log_dir / "gateway.log"),
             "StandardErrorPath": str(log_dir / "gateway.err.log"),
         }
@@ -1,9 +1,12 @@
 """Platform detection, executable resolution, and PATH enrichment."""
 
 import os
+import re
 import shutil
 import subprocess
 import sys
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
 
 from ragnarbot.daemon.base import DaemonError
@@ -18,8 +21,12 @@ class UnsupportedPlatformError(DaemonError):
     """Raised on platforms without daemon support (e.g. Windows)."""
 
 
+@lru_cache(maxsize=1)
 def detect_platform() -> str:
-    """Return 'macos' or 'linux'. Raises on Windows."""
+    """Return 'macos' or 'linux'. Raises on Windows.
+
+    The result is cached; sys.platform does not change within a process.
+    """
     if sys.platform == "darwin":
         return "macos"
     elif sys.platform.startswith("linux"):
@@ -30,26 +37,30 @@ def detect_platform() -> str:
     )
 
 
-def resolve_executable() -> list[str]:
-    """Resolve the ragnarbot executable as a command list for service files.
+@lru_cache(maxsize=1)
+def resolve_executable() -> tuple[str, ...]:
+    """Resolve the ragnarbot executable as a command for service files.
 
     Tries in order:
     1. shutil.which('ragnarbot')
     2. <sys.executable parent>/ragnarbot
     3. sys.executable -m ragnarbot  (fallback)
+
+    The result is cached; call ``resolve_executable.cache_clear()`` after
+    changing PATH (resolve_path() does this itself).
     """
     # 1. On PATH
     which = shutil.which("ragnarbot")
     if which:
-        return [which]
+        return (which,)
 
     # 2. Next to the Python interpreter
     sibling = Path(sys.executable).parent / "ragnarbot"
     if sibling.is_file():
-        return [str(sibling)]
+        return (str(sibling),)
 
     # 3. Module invocation
-    return [sys.executable, "-m", "ragnarbot"]
+    return (sys.executable, "-m", "ragnarbot")
 
 
 def get_log_dir() -> Path:
@@ -128,6 +139,10 @@ def _probe_login_shell() -> list[str]:
     return []
 
 
+# path_helper -s output: PATH="..."; export PATH; (MANPATH follows on its own line)
+_PATH_HELPER_RE = re.compile(r'^PATH="([^"]*)"', re.MULTILINE)
+
+
 def _probe_path_helper() -> list[str]:
     """Run macOS path_helper to get system-configured paths."""
     if sys.platform != "darwin":
@@ -143,24 +158,23 @@ def _probe_path_helper() -> list[str]:
             timeout=5,
         )
         if result.returncode == 0 and result.stdout:
-            # Output format: PATH="..."; export PATH;
-            line = result.stdout.strip()
-            if line.startswith('PATH="') and '"' in line[6:]:
-                raw = line[6:line.index('"', 6)]
-                return [p for p in raw.split(":") if p]
+            match = _PATH_HELPER_RE.search(result.stdout)
+            if match:
+                return [p for p in match.group(1).split(":") if p]
     except Exception:
         pass
     return []
 
 
-def _well_known_dirs() -> list[str]:
-    """Return well-known tool directories that exist on disk."""
+@lru_cache(maxsize=1)
+def _well_known_dirs() -> tuple[str, ...]:
+    """Return well-known tool directories that exist on disk (probed once)."""
     dirs: list[str] = []
     for d in _WELL_KNOWN_DIRS:
         expanded = os.path.expanduser(d)
         if os.path.isdir(expanded):
             dirs.append(expanded)
-    return dirs
+    return tuple(dirs)
 
 
 def resolve_path() -> None:
@@ -173,24 +187,17 @@ def resolve_path() -> None:
         current = os.environ.get("PATH", "")
         current_set = set(current.split(":")) if current else set()
 
-        discovered: list[str] = []
-
-        # 1. Login shell probe
-        for p in _probe_login_shell():
-            if p not in current_set and p not in discovered:
-                discovered.append(p)
-
-        # 2. macOS path_helper
-        for p in _probe_path_helper():
-            if p not in current_set and p not in discovered:
-                discovered.append(p)
-
-        # 3. Well-known directories
-        for p in _well_known_dirs():
-            if p not in current_set and p not in discovered:
-                discovered.append(p)
+        # Ordered, de-duplicated merge: login shell, then macOS path_helper,
+        # then well-known directories (dict keys keep first-seen order)
+        candidates = dict.fromkeys(chain(
+            _probe_login_shell(),
+            _probe_path_helper(),
+            _well_known_dirs(),
+        ))
+        discovered = [p for p in candidates if p not in current_set]
 
         if discovered:
             os.environ["PATH"] = ":".join(discovered) + ":" + current
+            resolve_executable.cache_clear()
     except Exception:
         pass
@@ -44,7 +44,8 @@ WantedBy=default.target
         unit_dir.mkdir(parents=True, exist_ok=True)
         unit_path.write_text(unit)
 
-        self._ctl("daemon-reload")
+        # enable resolves the unit file from disk and reloads the manager
+        # afterwards, so no separate daemon-reload round-trip is needed.
         self._ctl("enable", unit_name)
 
     def uninstall(self) -> None:
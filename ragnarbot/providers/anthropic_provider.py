@@ -1,8 +1,10 @@
 """Anthropic SDK provider for OAuth token support."""
 
 import asyncio
+import json
 import logging
 import os
+import re
 from typing import Any
 
 import httpx
@@ -43,6 +45,12 @@ _OVERLOADED_RETRY_DELAYS = [0, 1, 2]
 _MAX_APP_ATTEMPTS = 1 + len(_OVERLOADED_RETRY_DELAYS)
 _OPEN_STREAM_RETRY_DELAY_SECONDS = 0.75
 
+# Anthropic allows 4 cache breakpoints per request. The end of the system
+# prompt and the sliding history breakpoint take two; the rest go to the
+# boundaries between earlier system messages (prompt tiers) and to markers
+# the caller already placed on system blocks.
+_MAX_SYSTEM_TIER_BREAKPOINTS = 2
+
 logger = logging.getLogger(__name__)
 
 
@@ -110,7 +118,7 @@ class AnthropicProvider(LLMProvider):
             model = model[len("anthropic/"):]
 
         # Convert messages from OpenAI format to Anthropic format
-        system_prompt, anthropic_messages = self._convert_messages(messages)
+        system_blocks, anthropic_messages = self._convert_messages(messages)
 
         # Cache breakpoint 2: conversation history prefix
         # Mark the second-to-last user message so all previous context is cached
@@ -128,8 +136,8 @@ class AnthropicProvider(LLMProvider):
         elif temperature is not None:
             kwargs["temperature"] = temperature
 
-        if system_prompt or self.oauth_token:
-            kwargs["system"] = self._build_system(system_prompt)
+        if system_blocks or self.oauth_token:
+            kwargs["system"] = self._build_system(system_blocks)
 
         if tools:
             kwargs["tools"] = self._convert_tools(tools)
@@ -215,7 +223,9 @@ class AnthropicProvider(LLMProvider):
     def get_default_model(self) -> str:
         return self.default_model
 
-    def _build_system(self, system_prompt: str | None) -> list[dict[str, Any]]:
+    def _build_system(
+        self, system_blocks: list[dict[str, Any]] | None,
+    ) -> list[dict[str, Any]]:
         """Build system param as list of text blocks with cache_control.
 
         When using OAuth, the Claude Code identity block is prepended.
@@ -225,10 +235,10 @@ class AnthropicProvider(LLMProvider):
         blocks: list[dict[str, Any]] = []
         if self.oauth_token:
             blocks.append({"type": "text", "text": _CLAUDE_CODE_IDENTITY})
-        if system_prompt:
-            blocks.append({"type": "text", "text": system_prompt})
+        if system_blocks:
+            blocks.extend(system_blocks)
         if blocks:
-            blocks[-1]["cache_control"] = {"type": "ephemeral"}
+            blocks[-1] = {**blocks[-1], "cache_control": {"type": "ephemeral"}}
         return blocks
 
     @staticmethod
@@ -273,12 +283,20 @@ class AnthropicProvider(LLMProvider):
     @staticmethod
     def _convert_messages(
         messages: list[dict[str, Any]],
-    ) -> tuple[str | None, list[dict[str, Any]]]:
+    ) -> tuple[list[dict[str, Any]] | None, list[dict[str, Any]]]:
         """Convert OpenAI-format messages to Anthropic format.
 
-        Returns (system_prompt, messages).
+        Returns (system_blocks, messages). Each system message becomes one
+        or more text blocks so cache_control breakpoints set by the caller
+        survive the conversion. When several system messages are sent, each
+        one is a cache tier: the last block of every tier but the final one
+        gets a breakpoint, so a stable leading tier is still a cache hit
+        when a later tier changes between requests (cron agent runs send
+        cron rules, agent instructions and run details this way). Caller
+        breakpoints count against the same cap; past it, only the latest
+        ones are kept.
         """
-        system_parts: list[str] = []
+        system_tiers: list[list[dict[str, Any]]] = []
         anthropic_msgs: list[dict[str, Any]] = []
 
         for msg in messages:
@@ -286,8 +304,9 @@ class AnthropicProvider(LLMProvider):
             content = msg.get("content")
 
             if role == "system":
-                if isinstance(content, str):
-                    system_parts.append(content)
+                tier = _convert_system_content(content)
+                if tier:
+                    system_tiers.append(tier)
                 continue
 
             if role == "user":
@@ -304,11 +323,7 @@ class AnthropicProvider(LLMProvider):
                     fn = tc.get("function", {})
                     args = fn.get("arguments", {})
                     if isinstance(args, str):
-                        import json
-                        try:
-                            args = json.loads(args)
-                        except (json.JSONDecodeError, ValueError):
-                            args = {"raw": args}
+                        args = _parse_tool_arguments(args)
                     blocks.append({
                         "type": "tool_use",
                         "id": tc.get("id", ""),
@@ -334,8 +349,27 @@ class AnthropicProvider(LLMProvider):
         # Merge consecutive same-role messages (Anthropic requires alternation)
         anthropic_msgs = _merge_consecutive(anthropic_msgs)
 
-        system = "\n\n".join(system_parts) if system_parts else None
-        return system, anthropic_msgs
+        system_blocks = [block for tier in system_tiers for block in tier]
+        tier_ends: set[int] = set()
+        end = -1
+        for tier in system_tiers[:-1]:
+            end += len(tier)
+            tier_ends.add(end)
+        # Breakpoints before the final block (which _build_system marks): tier
+        # boundaries plus any the caller set. Keep only the latest ones so the
+        # request stays within Anthropic's limit.
+        marked = [
+            i for i, block in enumerate(system_blocks[:-1])
+            if i in tier_ends or "cache_control" in block
+        ]
+        keep = set(marked[-_MAX_SYSTEM_TIER_BREAKPOINTS:])
+        for i in marked:
+            if i in keep:
+                system_blocks[i].setdefault("cache_control", {"type": "ephemeral"})
+            else:
+                system_blocks[i].pop("cache_control", None)
+
+        return system_blocks or None, anthropic_msgs
 
     @staticmethod
     def _convert_tools(tools: list[dict[str, Any]]) -> list[dict[str, Any]]:
@@ -357,9 +391,10 @@ class AnthropicProvider(LLMProvider):
         tool_calls: list[ToolCallRequest] = []
 
         for block in response.content:
-            if block.type == "text":
+            block_type = block.type
+            if block_type == "text":
                 content_parts.append(block.text)
-            elif block.type == "tool_use":
+            elif block_type == "tool_use":
                 tool_calls.append(ToolCallRequest(
                     id=block.id,
                     name=block.name,
@@ -378,16 +413,19 @@ class AnthropicProvider(LLMProvider):
             finish_reason = stop_reason or "stop"
 
         usage = {}
-        if response.usage:
+        resp_usage = response.usage
+        if resp_usage:
+            input_tokens = resp_usage.input_tokens
+            output_tokens = resp_usage.output_tokens
             usage = {
-                "prompt_tokens": response.usage.input_tokens,
-                "completion_tokens": response.usage.output_tokens,
-                "total_tokens": response.usage.input_tokens + response.usage.output_tokens,
+                "prompt_tokens": input_tokens,
+                "completion_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
                 "cache_creation_input_tokens": (
-                    getattr(response.usage, "cache_creation_input_tokens", 0) or 0
+                    getattr(resp_usage, "cache_creation_input_tokens", 0) or 0
                 ),
                 "cache_read_input_tokens": (
-                    getattr(response.usage, "cache_read_input_tokens", 0) or 0
+                    getattr(resp_usage, "cache_read_input_tokens", 0) or 0
                 ),
             }
 
@@ -399,6 +437,44 @@ class AnthropicProvider(LLMProvider):
         )
 
 
+def _parse_tool_arguments(raw: str) -> Any:
+    """Parse a JSON tool-call argument string, keeping unparseable input as raw.
+
+    Stays on stdlib json: orjson rejects NaN and turns integers past 64 bits
+    into floats, and tool arguments must round-trip exactly.
+    """
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return {"raw": raw}
+
+
+def _convert_system_content(content: Any) -> list[dict[str, Any]]:
+    """Convert system message content to Anthropic text blocks.
+
+    Plain strings become a single text block. Multipart content keeps its
+    text parts, including any cache_control marker already attached.
+    """
+    if isinstance(content, str):
+        return [{"type": "text", "text": content}] if content else []
+
+    if not isinstance(content, list):
+        return []
+
+    blocks: list[dict[str, Any]] = []
+    for part in content:
+        if isinstance(part, dict) and part.get("type") == "text" and part.get("text"):
+            block: dict[str, Any] = {"type": "text", "text": part["text"]}
+            if "cache_control" in part:
+                block["cache_control"] = part["cache_control"]
+            blocks.append(block)
+    return blocks
+
+
+# data:<media type>[;params],<payload>
+_DATA_URL_RE = re.compile(r"data:([^;,]*)[^,]*,")
+
+
 def _convert_user_content(content: Any) -> Any:
     """Convert user message content (string or multipart) to Anthropic format."""
     if isinstance(content, str):
@@ -417,16 +493,15 @@ def _convert_user_content(content: Any) -> Any:
                 blocks.append({"type": "text", "text": part.get("text", "")})
             elif part_type == "image_url":
                 url = part.get("image_url", {}).get("url", "")
-                if url.startswith("data:"):
-                    # data:image/png;base64,AAAA...
-                    header, data = url.split(",", 1)
-                    media_type = header.split(":")[1].split(";")[0]
+                match = _DATA_URL_RE.match(url)
+                if match:
+                    # data:image/png;base64,AAAA... — slice the payload once
                     blocks.append({
                         "type": "image",
                         "source": {
                             "type": "base64",
-                            "media_type": media_type,
-                            "data": data,
+                            "media_type": match.group(1),
+                            "data": url[match.end():],
                         },
                     })
                 else:
@@ -442,27 +517,39 @@ def _convert_user_content(content: Any) -> Any:
 def _merge_consecutive(messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
     """Merge consecutive messages with the same role.
 
-    Anthropic requires strictly alternating user/assistant roles.
+    Anthropic requires strictly alternating user/assistant roles. A run of
+    same-role messages is merged into one copied message whose content list
+    is extended in place, so long tool_result runs stay linear.
     """
     if not messages:
         return messages
 
-    merged: list[dict[str, Any]] = [messages[0]]
+    merged: list[dict[str, Any]] = []
+    # True once merged[-1] is our own copy whose content list may be extended
+    owns_last = False
 
-    for msg in messages[1:]:
-        if msg["role"] == merged[-1]["role"]:
-            # Merge content
-            prev_content = merged[-1]["content"]
-            curr_content = msg["content"]
+    for msg in messages:
+        if not merged or msg["role"] != merged[-1]["role"]:
+            merged.append(msg)
+            owns_last = False
+            continue
 
-            # Normalise both to lists
-            if isinstance(prev_content, str):
-                prev_content = [{"type": "text", "text": prev_content}]
-            if isinstance(curr_content, str):
-                curr_content = [{"type": "text", "text": curr_content}]
+        if not owns_last:
+            prev = merged[-1]
+            merged[-1] = {**prev, "content": _content_blocks(prev["content"])}
+            owns_last = True
 
-            merged[-1]["content"] = prev_content + curr_content
+        curr_content = msg["content"]
+        if isinstance(curr_content, str):
+            merged[-1]["content"].append({"type": "text", "text": curr_content})
         else:
-            merged.append(msg)
+            merged[-1]["content"].extend(curr_content)
 
     return merged
+
+
+def _content_blocks(content: Any) -> list[Any]:
+    """Return message content as a new list of blocks."""
+    if isinstance(content, str):
+        return [{"type": "text", "text": content}]
+    return list(content)
@@ -281,14 +281,20 @@ class LiteLLMProvider(LLMProvider):
         cleaned = []
         for msg in messages:
             content = msg.get("content")
-            if isinstance(content, list):
-                new_content = []
-                for block in content:
-                    if isinstance(block, dict) and any(k.startswith("_") for k in block):
-                        block = {k: v for k, v in block.items() if not k.startswith("_")}
-                    new_content.append(block)
-                msg = {**msg, "content": new_content}
-            cleaned.append(msg)
+            # Most messages are plain text or carry no internal keys — pass
+            # them through without copying.
+            if not isinstance(content, list) or not any(
+                _has_internal_keys(block) for block in content
+            ):
+                cleaned.append(msg)
+                continue
+
+            new_content = [
+                {k: v for k, v in block.items() if not k.startswith("_")}
+                if _has_internal_keys(block) else block
+                for block in content
+            ]
+            cleaned.append({**msg, "content": new_content})
         return cleaned
 
     @staticmethod
@@ -553,3 +559,8 @@ class LiteLLMProvider(LLMProvider):
     def get_default_model(self) -> str:
         """Get the default model."""
         return self.default_model
+
+
+def _has_internal_keys(block: Any) -> bool:
+    """True for content-block dicts carrying underscore-prefixed internal keys."""
+    return isinstance(block, dict) and any(k.startswith("_") for k in block)
@@ -1,18 +1,20 @@
 """Session management for conversation history."""
 
-import base64
 import json
 import mimetypes
 import shutil
+import stat
 import uuid
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
 from loguru import logger
 
 from ragnarbot.utils.helpers import (
+    encode_base64,
     get_active_sessions_path,
     get_chats_path,
     get_sessions_path,
@@ -74,6 +76,20 @@ class Session:
         self.messages.append(msg)
         self.updated_at = datetime.now()
 
+    def extend_messages(self, rows: Iterable[tuple[str, str]]) -> None:
+        """Append plain-text ``(role, content)`` messages in one batch.
+
+        Equivalent to calling add_message() for each row without metadata,
+        but stamps every message with a single timestamp.
+        """
+        now = datetime.now()
+        timestamp = now.isoformat()
+        self.messages.extend(
+            {"role": role, "content": content, "metadata": {"timestamp": timestamp}}
+            for role, content in rows
+        )
+        self.updated_at = now
+
     def get_history(self) -> list[dict[str, Any]]:
         """
         Get message history for LLM context.
@@ -136,6 +152,48 @@ class Session:
         self.updated_at = datetime.now()
 
 
+# Three maximum-size (5 MB) images once base64-encoded
+_IMAGE_CACHE_MAX_BYTES = 20 * 1024 * 1024
+
+
+class _EncodedImageCache:
+    """Base64 encodings of image files, keyed by (path, mtime, size).
+
+    get_history() runs on every LLM turn and re-resolves every image_ref in
+    the history; the stat-derived key makes a rewritten file miss the cache.
+    Least recently used entries are evicted once the encoded strings exceed
+    max_bytes, so the long-running daemon never holds more than that.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple[str, int, int], str] = OrderedDict()
+        self._bytes = 0
+
+    def get(self, path: str, mtime_ns: int, size: int) -> str:
+        key = (path, mtime_ns, size)
+        b64 = self._entries.get(key)
+        if b64 is not None:
+            self._entries.move_to_end(key)
+            return b64
+
+        b64 = encode_base64(Path(path).read_bytes())
+        if len(b64) <= self.max_bytes:
+            self._entries[key] = b64
+            self._bytes += len(b64)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+        return b64
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+
+_image_cache = _EncodedImageCache(_IMAGE_CACHE_MAX_BYTES)
+
+
 def _resolve_tool_image_refs(msg: dict, refs: list[dict]) -> dict:
     """Re-encode tool image_refs from disk into multimodal content blocks.
 
@@ -145,11 +203,15 @@ def _resolve_tool_image_refs(msg: dict, refs: list[dict]) -> dict:
     blocks: list[dict[str, Any]] = []
     for ref in refs:
         p = Path(ref["path"])
-        if not p.is_file():
+        try:
+            st = p.stat()
+        except OSError:
+            continue
+        if not stat.S_ISREG(st.st_mode):
             continue
         mime = ref.get("mime") or mimetypes.guess_type(str(p))[0] or "image/jpeg"
         try:
-            b64 = base64.b64encode(p.read_bytes()).decode()
+            b64 = _image_cache.get(str(p), st.st_mtime_ns, st.st_size)
         except Exception:
             continue
         blocks.append({
@@ -3,6 +3,11 @@
 from datetime import datetime
 from pathlib import Path
 
+try:
+    from pybase64 import b64encode as _b64encode
+except ImportError:  # without the "speedups" extra, encode with the stdlib
+    from base64 import b64encode as _b64encode
+
 from ragnarbot.instance import ensure_instance_root, get_instance, resolve_workspace_path
 
 
@@ -90,6 +95,11 @@ def truncate_string(s: str, max_len: int = 100, suffix: str = "...") -> str:
     return s[: max_len - len(suffix)] + suffix
 
 
+def encode_base64(data: bytes) -> str:
+    """Base64-encode bytes to a str (pybase64 when it is installed)."""
+    return _b64encode(data).decode()
+
+
 def safe_filename(name: str) -> str:
     """Convert a string to a safe filename."""
     # Replace unsafe characters
@@ -15,6 +15,13 @@ from ragnarbot.agent.subagent import (
 )
 from ragnarbot.agent.tools.agent_tools import ACTIONS, AgentTool
 
+
+def _agent_md(name: str, description: str = "test", body: str = "body", **fields: str) -> str:
+    """Render AGENT.md content; extra frontmatter fields follow the description."""
+    extra = "".join(f"{key}: {value}\n" for key, value in fields.items())
+    return f"---\nname: {name}\ndescription: {description}\n{extra}---\n{body}"
+
+
 # ---------------------------------------------------------------------------
 # AgentsLoader
 # ---------------------------------------------------------------------------
@@ -29,7 +36,7 @@ class TestAgentsLoader:
 
     def test_list_builtin_agents(self, tmp_path):
         builtin = tmp_path / "builtin"
-        self._write_agent(builtin, "researcher", "---\nname: researcher\ndescription: Research agent\n---\nbody")
+        self._write_agent(builtin, "researcher", _agent_md("researcher", "Research agent"))
         loader = AgentsLoader(tmp_path / "workspace", builtin_agents_dir=builtin)
         agents = loader.list_agents()
         assert len(agents) == 1
@@ -39,8 +46,8 @@ class TestAgentsLoader:
     def test_workspace_overrides_builtin(self, tmp_path):
         builtin = tmp_path / "builtin"
         workspace = tmp_path / "workspace"
-        self._write_agent(builtin, "researcher", "---\nname: researcher\ndescription: builtin\n---\nbody")
-        self._write_agent(workspace / "agents", "researcher", "---\nname: researcher\ndescription: custom\n---\ncustom body")
+        self._write_agent(builtin, "researcher", _agent_md("researcher", "builtin"))
+        self._write_agent(workspace / "agents", "researcher", _agent_md("researcher", "custom", "custom body"))
         loader = AgentsLoader(workspace, builtin_agents_dir=builtin)
         agents = loader.list_agents()
         assert len(agents) == 1
@@ -49,10 +56,9 @@ class TestAgentsLoader:
 
     def test_load_agent_parses_frontmatter(self, tmp_path):
         builtin = tmp_path / "builtin"
-        content = (
-            "---\nname: researcher\ndescription: A researcher\nmodel: gpt-4\n"
-            "reasoningLevel: high\nallowedTools: [web_search, web_fetch]\n---\n\n"
-            "# Instructions\nDo research."
+        content = _agent_md(
+            "researcher", "A researcher", "\n# Instructions\nDo research.",
+            model="gpt-4", reasoningLevel="high", allowedTools="[web_search, web_fetch]",
         )
         self._write_agent(builtin, "researcher", content)
         loader = AgentsLoader(tmp_path / "workspace", builtin_agents_dir=builtin)
@@ -67,7 +73,7 @@ class TestAgentsLoader:
 
     def test_load_agent_default_values(self, tmp_path):
         builtin = tmp_path / "builtin"
-        content = "---\nname: helper\ndescription: A helper\n---\nBody here."
+        content = _agent_md("helper", "A helper", "Body here.")
         self._write_agent(builtin, "helper", content)
         loader = AgentsLoader(tmp_path / "workspace", builtin_agents_dir=builtin)
         defn = loader.load_agent("helper")
@@ -78,9 +84,7 @@ class TestAgentsLoader:
 
     def test_load_agent_invalid_reasoning_level_falls_back_to_inherit(self, tmp_path):
         builtin = tmp_path / "builtin"
-        content = (
-            "---\nname: helper\ndescription: A helper\nreasoningLevel: turbo\n---\nBody here."
-        )
+        content = _agent_md("helper", "A helper", "Body here.", reasoningLevel="turbo")
         self._write_agent(builtin, "helper", content)
         loader = AgentsLoader(tmp_path / "workspace", builtin_agents_dir=builtin)
         defn = loader.load_agent("helper")
@@ -93,7 +97,7 @@ class TestAgentsLoader:
 
     def test_build_agents_summary(self, tmp_path):
         builtin = tmp_path / "builtin"
-        self._write_agent(builtin, "researcher", "---\nname: researcher\ndescription: Research agent\n---\nbody")
+        self._write_agent(builtin, "researcher", _agent_md("researcher", "Research agent"))
         loader = AgentsLoader(tmp_path / "workspace", builtin_agents_dir=builtin)
         summary = loader.build_agents_summary()
         assert "<agents>" in summary
@@ -104,11 +108,22 @@ class TestAgentsLoader:
         loader = AgentsLoader(tmp_path / "workspace", builtin_agents_dir=tmp_path / "nope")
         assert loader.build_agents_summary() == ""
 
+    def test_from_mapping_loads_without_disk(self):
+        loader = AgentsLoader.from_mapping({
+            "helper": _agent_md("helper", "Helps", "Be helpful.", allowedTools="[web_search]"),
+        })
+        defn = loader.load_agent("helper")
+        assert defn.body == "Be helpful."
+        assert defn.allowed_tools == ["web_search"]
+        assert loader.load_agent("missing") is None
+        assert [a["name"] for a in loader.list_agents()] == ["helper"]
+
     def test_builtin_researchers_exist(self):
         """Verify the built-in researcher agents are present in the package."""
-        from ragnarbot.agent.agents_loader import BUILTIN_AGENTS_DIR
-        assert (BUILTIN_AGENTS_DIR / "deep-researcher" / "AGENT.md").exists()
-        assert (BUILTIN_AGENTS_DIR / "fast-researcher" / "AGENT.md").exists()
+        from ragnarbot.agent.agents_loader import builtin_agent_exists
+        assert builtin_agent_exists("deep-researcher")
+        assert builtin_agent_exists("fast-researcher")
+        assert not builtin_agent_exists("no-such-agent")
 
     def test_builtin_researchers_use_absolute_paths_in_delivery_examples(self):
         """Researcher delivery examples should instruct absolute paths, not relative ones."""
@@ -217,7 +232,7 @@ class TestSubagentManager:
         d = builtin / "bad_agent"
         d.mkdir(parents=True)
         (d / "AGENT.md").write_text(
-            "---\nname: bad_agent\ndescription: bad\nallowedTools: [send_photo, cron]\n---\nbody",
+            _agent_md("bad_agent", "bad", allowedTools="[send_photo, cron]"),
             encoding="utf-8",
         )
         loader = AgentsLoader(tmp_path / "workspace", builtin_agents_dir=builtin)
@@ -342,15 +357,11 @@ async def test_subagent_chat_does_not_pass_explicit_max_tokens(tmp_path):
     """
     from ragnarbot.providers.base import LLMResponse
 
-    captured_kwargs: dict = {}
-
-    async def fake_chat(**kwargs):
-        captured_kwargs.update(kwargs)
-        return LLMResponse(content="done", finish_reason="stop")
-
     provider = MagicMock()
     provider.get_default_model.return_value = "test/model"
-    provider.chat = fake_chat
+    provider.chat = AsyncMock(
+        return_value=LLMResponse(content="done", finish_reason="stop"),
+    )
 
     bus = MagicMock()
     bus.publish_inbound = AsyncMock()
@@ -376,7 +387,8 @@ async def test_subagent_chat_does_not_pass_explicit_max_tokens(tmp_path):
 
     # The provider.chat was called — check that max_tokens was NOT passed
     # explicitly, meaning the provider will use DEFAULT_MAX_TOKENS internally.
-    assert "max_tokens" not in captured_kwargs, (
+    provider.chat.assert_awaited()
+    assert "max_tokens" not in provider.chat.await_args.kwargs, (
         "Sub-agent should NOT pass explicit max_tokens — "
         "the provider uses DEFAULT_MAX_TOKENS as fallback"
     )
@@ -512,7 +524,7 @@ async def test_named_subagent_uses_reasoning_level_from_agent_definition(tmp_pat
     d = builtin / "researcher"
     d.mkdir(parents=True)
     (d / "AGENT.md").write_text(
-        "---\nname: researcher\ndescription: Research\nreasoningLevel: low\n---\nDo work.",
+        _agent_md("researcher", "Research", "Do work.", reasoningLevel="low"),
         encoding="utf-8",
     )
     loader = AgentsLoader(tmp_path / "workspace", builtin_agents_dir=builtin)
@@ -551,14 +563,10 @@ async def test_named_subagent_uses_reasoning_level_from_agent_definition(tmp_pat
 
 def test_safe_tool_names():
     """Verify safe tool names constant is populated correctly."""
-    assert "file_read" in SAFE_TOOL_NAMES
-    assert "exec" in SAFE_TOOL_NAMES
-    assert "web_search" in SAFE_TOOL_NAMES
+    assert isinstance(SAFE_TOOL_NAMES, frozenset)
+    assert {"file_read", "exec", "web_search"} <= SAFE_TOOL_NAMES
     # Ensure dangerous tools are NOT in the set
-    assert "spawn" not in SAFE_TOOL_NAMES
-    assert "cron" not in SAFE_TOOL_NAMES
-    assert "config" not in SAFE_TOOL_NAMES
-    assert "restart" not in SAFE_TOOL_NAMES
+    assert SAFE_TOOL_NAMES.isdisjoint({"spawn", "cron", "config", "restart"})
 
 
 # ---------------------------------------------------------------------------
@@ -578,7 +586,7 @@ class TestAllowedSkillsParsing:
         builtin = tmp_path / "builtin"
         self._write_agent(
             builtin, "agent1",
-            "---\nname: agent1\ndescription: test\n---\nbody",
+            _agent_md("agent1"),
         )
         loader = AgentsLoader(tmp_path / "workspace", builtin_agents_dir=builtin)
         defn = loader.load_agent("agent1")
@@ -588,7 +596,7 @@ class TestAllowedSkillsParsing:
         builtin = tmp_path / "builtin"
         self._write_agent(
             builtin, "agent1",
-            "---\nname: agent1\ndescription: test\nallowedSkills: all\n---\nbody",
+            _agent_md("agent1", allowedSkills="all"),
         )
         loader = AgentsLoader(tmp_path / "workspace", builtin_agents_dir=builtin)
         defn = loader.load_agent("agent1")
@@ -598,7 +606,7 @@ class TestAllowedSkillsParsing:
         builtin = tmp_path / "builtin"
         self._write_agent(
             builtin, "agent1",
-            "---\nname: agent1\ndescription: test\nallowedSkills: none\n---\nbody",
+            _agent_md("agent1", allowedSkills="none"),
         )
         loader = AgentsLoader(tmp_path / "workspace", builtin_agents_dir=builtin)
         defn = loader.load_agent("agent1")
@@ -608,8 +616,7 @@ class TestAllowedSkillsParsing:
         builtin = tmp_path / "builtin"
         self._write_agent(
             builtin, "agent1",
-            "---\nname: agent1\ndescription: test\n"
-            "allowedSkills: [seo-optimizer, prompt-engineering]\n---\nbody",
+            _agent_md("agent1", allowedSkills="[seo-optimizer, prompt-engineering]"),
         )
         loader = AgentsLoader(tmp_path / "workspace", builtin_agents_dir=builtin)
         defn = loader.load_agent("agent1")
@@ -644,11 +651,19 @@ class TestSubagentSkillsInjection:
             context_builder=context_builder,
         )
 
-    def test_skills_section_injected_when_allowed(self, tmp_path):
-        """Named agent with allowed_skills gets a skills section in its prompt."""
+    @pytest.mark.parametrize(
+        ("allowed_skills", "expect_section", "expected_only"),
+        [
+            (["my-skill"], True, ["my-skill"]),
+            ("none", False, None),
+            ("all", True, None),
+        ],
+        ids=["explicit-list", "none", "all"],
+    )
+    def test_skills_injection(self, tmp_path, allowed_skills, expect_section, expected_only):
+        """allowed_skills controls the skills section and the summary filter."""
         from ragnarbot.agent.subagent import AgentTask, AgentTaskStatus
 
-        # Create a mock context_builder with skills
         ctx = MagicMock()
         ctx.skills.build_skills_summary.return_value = (
             "<skills>\n"
@@ -666,7 +681,7 @@ class TestSubagentSkillsInjection:
             description="test",
             model="default",
             allowed_tools=["web_search"],
-            allowed_skills=["my-skill"],
+            allowed_skills=allowed_skills,
             body="Do the work.",
             path="/fake/path",
         )
@@ -678,63 +693,14 @@ class TestSubagentSkillsInjection:
         )
 
         prompt = mgr._build_system_prompt(task, defn)
-        assert "Available Skills" in prompt
-        assert "my-skill" in prompt
-        assert "file_read" in prompt
-        ctx.skills.build_skills_summary.assert_called_once_with(only=["my-skill"])
-
-    def test_skills_section_absent_when_none(self, tmp_path):
-        """Named agent with allowed_skills='none' gets no skills section."""
-        from ragnarbot.agent.subagent import AgentTask, AgentTaskStatus
-
-        ctx = MagicMock()
-        mgr = self._make_manager(tmp_path, context_builder=ctx)
-        defn = AgentDefinition(
-            name="noskill",
-            description="test",
-            model="default",
-            allowed_tools=["web_search"],
-            allowed_skills="none",
-            body="Do the work.",
-            path="/fake/path",
-        )
-        task = AgentTask(
-            id="t2", label="test", agent_name="noskill", task="go",
-            status=AgentTaskStatus.running, messages=[],
-            stop_event=asyncio.Event(), created_at="",
-            origin={"channel": "cli", "chat_id": "direct"},
-        )
-
-        prompt = mgr._build_system_prompt(task, defn)
-        assert "Available Skills" not in prompt
-        ctx.skills.build_skills_summary.assert_not_called()
-
-    def test_all_skills_passes_none_filter(self, tmp_path):
-        """allowed_skills='all' passes only=None to build_skills_summary."""
-        from ragnarbot.agent.subagent import AgentTask, AgentTaskStatus
-
-        ctx = MagicMock()
-        ctx.skills.build_skills_summary.return_value = "<skills></skills>"
-
-        mgr = self._make_manager(tmp_path, context_builder=ctx)
-        defn = AgentDefinition(
-            name="allskills",
-            description="test",
-            model="default",
-            allowed_tools="all",
-            allowed_skills="all",
-            body="Do the work.",
-            path="/fake/path",
-        )
-        task = AgentTask(
-            id="t3", label="test", agent_name="allskills", task="go",
-            status=AgentTaskStatus.running, messages=[],
-            stop_event=asyncio.Event(), created_at="",
-            origin={"channel": "cli", "chat_id": "direct"},
-        )
-
-        mgr._build_system_prompt(task, defn)
-        ctx.skills.build_skills_summary.assert_called_once_with(only=None)
+        if expect_section:
+            assert "Available Skills" in prompt
+            assert "my-skill" in prompt
+            assert "file_read" in prompt
+            ctx.skills.build_skills_summary.assert_called_once_with(only=expected_only)
+        else:
+            assert "Available Skills" not in prompt
+            ctx.skills.build_skills_summary.assert_not_called()
 
     def test_named_agent_prompt_includes_openai_behavior_addendum(self, tmp_path):
         """Named agent prompts get the OpenAI style addendum for OpenAI-family models."""
@@ -990,10 +956,23 @@ class TestCronToolAgentParam:
 # Cron isolated with agent profile
 # ---------------------------------------------------------------------------
 
+@pytest.fixture(scope="module")
+def shared_loop(tmp_path_factory):
+    """One AgentLoop for tests that only build registries and never mutate it."""
+    root = tmp_path_factory.mktemp("cron_agent")
+    # Module scope runs before conftest's per-test profile isolation
+    fake_home = root / "profile-home"
+    fake_home.mkdir()
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("ragnarbot.instance.Path.home", lambda: fake_home)
+        yield TestCronIsolatedAgentProfile._make_agent_loop(root)
+
+
 class TestCronIsolatedAgentProfile:
     """Test process_cron_isolated with and without agent_name."""
 
-    def _make_agent_loop(self, tmp_path, agents_loader=None):
+    @staticmethod
+    def _make_agent_loop(tmp_path, agents_loader=None):
         """Create a minimal AgentLoop for testing."""
         from ragnarbot.agent.loop import AgentLoop
         from ragnarbot.config.schema import ExecToolConfig
@@ -1028,8 +1007,10 @@ class TestCronIsolatedAgentProfile:
         d = builtin / "researcher"
         d.mkdir(parents=True)
         (d / "AGENT.md").write_text(
-            "---\nname: researcher\ndescription: Research\n---\n\n"
-            "You are a research specialist. Find and synthesize information.",
+            _agent_md(
+                "researcher", "Research",
+                "\nYou are a research specialist. Find and synthesize information.",
+            ),
             encoding="utf-8",
         )
         loader = AgentsLoader(tmp_path / "workspace", builtin_agents_dir=builtin)
@@ -1050,31 +1031,90 @@ class TestCronIsolatedAgentProfile:
             defn, "Research AI news", session_metadata, "test/model",
         )
 
-        assert len(messages) == 2
-        assert messages[0]["role"] == "system"
-        assert messages[1]["role"] == "user"
-        assert messages[1]["content"] == "Research AI news"
+        assert [m["role"] for m in messages] == ["system", "system", "system", "user"]
+        assert messages[3]["content"] == "Research AI news"
+
+        rules, agent, run = (m["content"] for m in messages[:3])
+        # Tier 1: cron rules only, no per-run or per-agent text
+        assert "deliver_result" in rules
+        assert "NOT an interactive conversation" in rules
+        assert f"**Workspace:** {loop.workspace.expanduser().resolve()}" in rules
+        assert "absolute path under the workspace above" in rules
+        assert "research job" not in rules
+        assert "research specialist" not in rules
+        # Tier 2: agent instructions after the separator
+        assert agent.startswith("---\n\n# Agent Instructions")
+        assert "research specialist" in agent
+        assert "research job" not in agent
+        # Tier 3: per-run job details and task
+        assert run.startswith("---\n\n")
+        assert "**Job:** research job" in run
+        assert "**Schedule:** every 1h" in run
+        assert "Research AI news" in run
+
+    def test_build_cron_agent_messages_stable_tiers_repeat_across_runs(self, tmp_path):
+        """Only the last system tier changes between runs of the same agent."""
+        loader = AgentsLoader.from_mapping({
+            "researcher": _agent_md("researcher", "Research", "Find things."),
+        })
+        loop = self._make_agent_loop(tmp_path, agents_loader=loader)
+        defn = loader.load_agent("researcher")
+
+        def build(job: str, task: str) -> list[dict]:
+            metadata = {"cron_isolated": {
+                "job_name": job, "schedule_desc": "every 1h", "task_message": task,
+            }}
+            return loop._build_cron_agent_messages(defn, task, metadata, "test/model")
+
+        first, second = build("morning", "Task A"), build("evening", "Task B")
+        assert first[:2] == second[:2]
+        assert first[2] != second[2]
 
-        system_prompt = messages[0]["content"]
-        # Should contain cron rules
-        assert "deliver_result" in system_prompt
-        assert "NOT an interactive conversation" in system_prompt
-        assert f"**Workspace:** {loop.workspace.expanduser().resolve()}" in system_prompt
-        assert "absolute path under the workspace above" in system_prompt
-        # Should contain agent instructions
-        assert "research specialist" in system_prompt
+    def test_cron_agent_tiers_get_anthropic_breakpoints(self, tmp_path):
+        """The Anthropic provider caches each stable tier of the cron prompt."""
+        from ragnarbot.providers.anthropic_provider import AnthropicProvider
+
+        loader = AgentsLoader.from_mapping({
+            "researcher": _agent_md("researcher", "Research", "Find things."),
+        })
+        loop = self._make_agent_loop(tmp_path, agents_loader=loader)
+        metadata = {"cron_isolated": {
+            "job_name": "job", "schedule_desc": "every 1h", "task_message": "Task",
+        }}
+        messages = loop._build_cron_agent_messages(
+            loader.load_agent("researcher"), "Task", metadata, "test/model",
+        )
+        # A tool round trip, so the history breakpoint is placed too
+        messages += [
+            {"role": "assistant", "content": "", "tool_calls": [
+                {"id": "tc_1", "function": {"name": "web_search", "arguments": "{}"}},
+            ]},
+            {"role": "tool", "tool_call_id": "tc_1", "content": "results"},
+        ]
+
+        provider = AnthropicProvider(api_key="sk-test")
+        system_blocks, anthropic_msgs = provider._convert_messages(messages)
+        system = provider._build_system(system_blocks)
+        provider._inject_history_cache_control(anthropic_msgs)
+
+        assert ["cache_control" in b for b in system] == [True, True, True]
+        assert system[0]["text"].startswith("# Cron Job")
+        assert "Find things." in system[1]["text"]
+        history_marks = sum(
+            "cache_control" in b
+            for m in anthropic_msgs if isinstance(m["content"], list)
+            for b in m["content"]
+        )
+        assert 3 + history_marks == 4
 
     def test_build_cron_agent_messages_includes_skills(self, tmp_path):
         """Skills summary is injected when agent has allowed_skills."""
-        builtin = tmp_path / "builtin"
-        d = builtin / "skilled"
-        d.mkdir(parents=True)
-        (d / "AGENT.md").write_text(
-            "---\nname: skilled\ndescription: Skilled agent\n"
-            "allowedSkills: [my-skill]\n---\nDo things with skills.",
-            encoding="utf-8",
-        )
-        loader = AgentsLoader(tmp_path / "workspace", builtin_agents_dir=builtin)
+        loader = AgentsLoader.from_mapping({
+            "skilled": _agent_md(
+                "skilled", "Skilled agent", "Do things with skills.",
+                allowedSkills="[my-skill]",
+            ),
+        })
         loop = self._make_agent_loop(tmp_path, agents_loader=loader)
 
         # Mock skills loader
@@ -1100,7 +1140,7 @@ class TestCronIsolatedAgentProfile:
         messages = loop._build_cron_agent_messages(
             defn, "Do work", session_metadata, "test/model",
         )
-        system_prompt = messages[0]["content"]
+        system_prompt = messages[1]["content"]
 
         assert "Available Skills" in system_prompt
         assert "my-skill" in system_prompt
@@ -1117,7 +1157,7 @@ class TestCronIsolatedAgentProfile:
         d = builtin / "researcher"
         d.mkdir(parents=True)
         (d / "AGENT.md").write_text(
-            "---\nname: researcher\ndescription: Research\nmodel: default\n---\nDo work.",
+            _agent_md("researcher", "Research", "Do work.", model="default"),
             encoding="utf-8",
         )
         loader = AgentsLoader(tmp_path / "workspace", builtin_agents_dir=builtin)
@@ -1137,11 +1177,11 @@ class TestCronIsolatedAgentProfile:
         assert result == "done"
         call_kwargs = loop.provider.chat.await_args.kwargs
         assert call_kwargs["model"] == "openai/gpt-5.4"
-        assert OPENAI_STYLE_ADDENDUM in call_kwargs["messages"][0]["content"]
+        assert OPENAI_STYLE_ADDENDUM in call_kwargs["messages"][1]["content"]
 
-    def test_build_cron_agent_tool_registry_filters_tools(self, tmp_path):
+    def test_build_cron_agent_tool_registry_filters_tools(self, shared_loop):
         """Agent with restricted tools gets only those tools + deliver_result."""
-        loop = self._make_agent_loop(tmp_path)
+        loop = shared_loop
 
         defn = AgentDefinition(
             name="restricted",
@@ -1163,9 +1203,27 @@ class TestCronIsolatedAgentProfile:
         assert not reg.has("file_write")
         assert not reg.has("cron")
 
-    def test_build_cron_agent_tool_registry_all_tools(self, tmp_path):
+    def test_build_cron_agent_tool_registry_fresh_deliver_shared_schema(self, shared_loop):
+        """Each build gets its own deliver_result state but the same schema."""
+        defn = AgentDefinition(
+            name="restricted",
+            description="test",
+            model="default",
+            allowed_tools=["web_search"],
+            allowed_skills="none",
+            body="body",
+            path="/fake/path",
+        )
+
+        _, first = shared_loop._build_cron_agent_tool_registry(defn, "cli", "direct")
+        _, second = shared_loop._build_cron_agent_tool_registry(defn, "cli", "direct")
+
+        assert first is not second
+        assert first.parameters is second.parameters
+
+    def test_build_cron_agent_tool_registry_all_tools(self, shared_loop):
         """Agent with allowedTools='all' gets the full isolated registry."""
-        loop = self._make_agent_loop(tmp_path)
+        loop = shared_loop
 
         defn = AgentDefinition(
             name="full",
@@ -1185,9 +1243,9 @@ class TestCronIsolatedAgentProfile:
         assert reg.has("web_search")
         assert reg.has("deliver_result")
 
-    def test_build_cron_agent_tool_registry_adds_file_read_for_skills(self, tmp_path):
+    def test_build_cron_agent_tool_registry_adds_file_read_for_skills(self, shared_loop):
         """file_read is auto-added when agent has allowed_skills."""
-        loop = self._make_agent_loop(tmp_path)
+        loop = shared_loop
 
         defn = AgentDefinition(
             name="skilled",
@@ -1240,8 +1298,10 @@ class TestCronIsolatedAgentProfile:
         d = builtin / "researcher"
         d.mkdir(parents=True)
         (d / "AGENT.md").write_text(
-            "---\nname: researcher\ndescription: Research\n"
-            "model: openai/gpt-5.4-mini\nreasoningLevel: low\n---\nDo work.",
+            _agent_md(
+                "researcher", "Research", "Do work.",
+                model="openai/gpt-5.4-mini", reasoningLevel="low",
+            ),
             encoding="utf-8",
         )
         loader = AgentsLoader(tmp_path / "workspace", builtin_agents_dir=builtin)
@@ -1262,7 +1322,7 @@ class TestCronIsolatedAgentProfile:
         call_kwargs = loop.provider.chat.await_args.kwargs
         assert call_kwargs["model"] == "openai/gpt-5.4-mini"
         assert call_kwargs["reasoning_level"] == "low"
-        assert OPENAI_STYLE_ADDENDUM in call_kwargs["messages"][0]["content"]
+        assert OPENAI_STYLE_ADDENDUM in call_kwargs["messages"][1]["content"]
 
 
 @pytest.mark.asyncio
@@ -1,5 +1,7 @@
 """Tests for AnthropicProvider message/tool conversion and response parsing."""
 
+import math
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
@@ -24,18 +26,79 @@ class TestConvertMessages:
             {"role": "user", "content": "Hi"},
         ]
         system, msgs = AnthropicProvider._convert_messages(messages)
-        assert system == "You are helpful."
+        assert system == [{"type": "text", "text": "You are helpful."}]
         assert len(msgs) == 1
         assert msgs[0]["role"] == "user"
 
-    def test_multiple_system_joined(self):
+    def test_multiple_system_blocks(self):
         messages = [
             {"role": "system", "content": "Part 1"},
             {"role": "system", "content": "Part 2"},
             {"role": "user", "content": "Hi"},
         ]
         system, msgs = AnthropicProvider._convert_messages(messages)
-        assert system == "Part 1\n\nPart 2"
+        # Every tier but the last gets its own breakpoint; _build_system
+        # marks the final block.
+        assert system == [
+            {"type": "text", "text": "Part 1", "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": "Part 2"},
+        ]
+
+    def test_system_tier_breakpoints_capped(self):
+        messages = [{"role": "system", "content": f"Tier {i}"} for i in range(5)]
+        system, _ = AnthropicProvider._convert_messages(messages)
+        marked = [b["text"] for b in system if "cache_control" in b]
+        assert marked == ["Tier 2", "Tier 3"]
+
+    def test_caller_breakpoints_count_toward_tier_cap(self):
+        cc = {"type": "ephemeral"}
+        messages = [
+            {
+                "role": "system",
+                "content": [
+                    {"type": "text", "text": "A", "cache_control": cc},
+                    {"type": "text", "text": "B", "cache_control": cc},
+                ],
+            },
+            {"role": "system", "content": "Tier 1"},
+            {"role": "system", "content": "Tier 2"},
+            {"role": "user", "content": "Hi"},
+        ]
+        system, _ = AnthropicProvider._convert_messages(messages)
+        marked = [b["text"] for b in system if "cache_control" in b]
+        # With the final block _build_system marks and the history
+        # breakpoint, that is Anthropic's limit of 4
+        assert marked == ["B", "Tier 1"]
+
+        provider = AnthropicProvider(api_key="sk-test")
+        assert sum("cache_control" in b for b in provider._build_system(system)) == 3
+
+    def test_system_list_content_keeps_cache_control(self):
+        messages = [
+            {
+                "role": "system",
+                "content": [
+                    {"type": "text", "text": "Rules", "cache_control": {"type": "ephemeral"}},
+                    {"type": "text", "text": "Task"},
+                ],
+            },
+            {"role": "user", "content": "Hi"},
+        ]
+        system, _ = AnthropicProvider._convert_messages(messages)
+        assert system == [
+            {"type": "text", "text": "Rules", "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": "Task"},
+        ]
+
+    def test_build_system_marks_last_block(self):
+        provider = AnthropicProvider(api_key="sk-test")
+        blocks = [{"type": "text", "text": "A"}, {"type": "text", "text": "B"}]
+        system = provider._build_system(blocks)
+        assert "cache_control" not in system[0]
+        assert system[-1] == {
+            "type": "text", "text": "B", "cache_control": {"type": "ephemeral"},
+        }
+        assert "cache_control" not in blocks[-1]
 
     def test_no_system(self):
         messages = [{"role": "user", "content": "Hi"}]
@@ -98,6 +161,45 @@ class TestConvertMessages:
         tool_block = msgs[1]["content"][0]  # no text block since content=""
         assert tool_block["input"] == {"path": "/tmp/x"}
 
+    def test_assistant_tool_calls_invalid_json_arguments_kept_raw(self):
+        messages = [
+            {"role": "user", "content": "Do it"},
+            {
+                "role": "assistant",
+                "content": "",
+                "tool_calls": [
+                    {
+                        "id": "tc_3",
+                        "function": {"name": "read_file", "arguments": '{"path": '},
+                    }
+                ],
+            },
+        ]
+        _, msgs = AnthropicProvider._convert_messages(messages)
+        assert msgs[1]["content"][0]["input"] == {"raw": '{"path": '}
+
+    def test_assistant_tool_calls_arguments_keep_nan_and_big_ints(self):
+        messages = [
+            {"role": "user", "content": "Do it"},
+            {
+                "role": "assistant",
+                "content": "",
+                "tool_calls": [
+                    {
+                        "id": "tc_4",
+                        "function": {
+                            "name": "calc",
+                            "arguments": '{"x": NaN, "n": 123456789012345678901234567890}',
+                        },
+                    }
+                ],
+            },
+        ]
+        _, msgs = AnthropicProvider._convert_messages(messages)
+        args = msgs[1]["content"][0]["input"]
+        assert math.isnan(args["x"])
+        assert args["n"] == 123456789012345678901234567890
+
     def test_tool_result_conversion(self):
         messages = [
             {"role": "user", "content": "Go"},
@@ -144,6 +246,12 @@ class TestConvertUserContent:
         assert result[0]["source"]["media_type"] == "image/png"
         assert result[0]["source"]["data"] == "iVBORw0KGgo="
 
+    def test_remote_image_url(self):
+        url = "https://example.com/cat.png"
+        content = [{"type": "image_url", "image_url": {"url": url}}]
+        result = _convert_user_content(content)
+        assert result[0] == {"type": "image", "source": {"type": "url", "url": url}}
+
     def test_text_part(self):
         content = [{"type": "text", "text": "describe this"}]
         result = _convert_user_content(content)
@@ -212,6 +320,18 @@ class TestMergeConsecutive:
         assert len(merged) == 1
         assert len(merged[0]["content"]) == 2
 
+    def test_merge_run_does_not_mutate_inputs(self):
+        first = {"role": "user", "content": [{"type": "text", "text": "A"}]}
+        msgs = [
+            first,
+            {"role": "user", "content": "B"},
+            {"role": "user", "content": [{"type": "text", "text": "C"}]},
+        ]
+        merged = _merge_consecutive(msgs)
+        assert len(merged) == 1
+        assert [b["text"] for b in merged[0]["content"]] == ["A", "B", "C"]
+        assert first["content"] == [{"type": "text", "text": "A"}]
+
     def test_empty_list(self):
         assert _merge_consecutive([]) == []
 
@@ -223,17 +343,14 @@ class TestMergeConsecutive:
 
 class TestParseResponse:
     def _make_response(self, content_blocks, stop_reason="end_turn", input_tokens=10, output_tokens=5):
-        response = MagicMock()
-        response.content = content_blocks
-        response.stop_reason = stop_reason
-        response.usage.input_tokens = input_tokens
-        response.usage.output_tokens = output_tokens
-        return response
+        return SimpleNamespace(
+            content=content_blocks,
+            stop_reason=stop_reason,
+            usage=SimpleNamespace(input_tokens=input_tokens, output_tokens=output_tokens),
+        )
 
     def test_text_response(self):
-        text_block = MagicMock()
-        text_block.type = "text"
-        text_block.text = "Hello!"
+        text_block = SimpleNamespace(type="text", text="Hello!")
 
         response = self._make_response([text_block])
         result = AnthropicProvider._parse_response(response)
@@ -246,11 +363,9 @@ class TestParseResponse:
         assert result.usage["total_tokens"] == 15
 
     def test_tool_use_response(self):
-        tool_block = MagicMock()
-        tool_block.type = "tool_use"
-        tool_block.id = "tu_123"
-        tool_block.name = "web_search"
-        tool_block.input = {"query": "test"}
+        tool_block = SimpleNamespace(
+            type="tool_use", id="tu_123", name="web_search", input={"query": "test"},
+        )
 
         response = self._make_response([tool_block], stop_reason="tool_use")
         result = AnthropicProvider._parse_response(response)
@@ -263,15 +378,10 @@ class TestParseResponse:
         assert result.finish_reason == "tool_calls"
 
     def test_mixed_content(self):
-        text_block = MagicMock()
-        text_block.type = "text"
-        text_block.text = "Let me search."
-
-        tool_block = MagicMock()
-        tool_block.type = "tool_use"
-        tool_block.id = "tu_456"
-        tool_block.name = "read_file"
-        tool_block.input = {"path": "/tmp/x"}
+        text_block = SimpleNamespace(type="text", text="Let me search.")
+        tool_block = SimpleNamespace(
+            type="tool_use", id="tu_456", name="read_file", input={"path": "/tmp/x"},
+        )
 
         response = self._make_response([text_block, tool_block], stop_reason="tool_use")
         result = AnthropicProvider._parse_response(response)
@@ -281,9 +391,7 @@ class TestParseResponse:
         assert result.finish_reason == "tool_calls"
 
     def test_max_tokens_finish_reason(self):
-        text_block = MagicMock()
-        text_block.type = "text"
-        text_block.text = "Truncated..."
+        text_block = SimpleNamespace(type="text", text="Truncated...")
 
         response = self._make_response([text_block], stop_reason="max_tokens")
         result = AnthropicProvider._parse_response(response)
@@ -262,6 +262,20 @@ class TestInjectCompaction:
 
 
 class TestGetHistoryWithCompaction:
+    def test_extend_messages_matches_add_message(self):
+        added = Session(key="a", user_key="test:1")
+        added.add_message("user", "hi")
+        added.add_message("assistant", "hello")
+
+        extended = Session(key="b", user_key="test:1")
+        extended.extend_messages([("user", "hi"), ("assistant", "hello")])
+
+        def without_timestamps(msgs):
+            return [{k: v for k, v in m.items() if k != "metadata"} for m in msgs]
+
+        assert without_timestamps(extended.messages) == without_timestamps(added.messages)
+        assert extended.messages[0]["metadata"].keys() == {"timestamp"}
+
     def test_starts_from_last_compaction(self):
         session = Session(key="test", user_key="test:1", messages=[
             {"role": "user", "content": "old msg", "metadata": {}},
@@ -5,18 +5,17 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from ragnarbot.agent.tools.config_tool import ConfigTool
+from ragnarbot.agent.tools.config_tool import ConfigTool, _paths_with_prefix
 from ragnarbot.auth.credentials import (
     Credentials,
     ProviderCredentials,
     ProvidersCredentials,
 )
-from ragnarbot.config.schema import Config
+from ragnarbot.config import loader
+from ragnarbot.config.path_utils import get_all_paths
+from ragnarbot.config.schema import Config, default_config
 
-LOAD_CONFIG = "ragnarbot.config.loader.load_config"
 SAVE_CONFIG = "ragnarbot.config.loader.save_config"
-LOAD_CREDS = "ragnarbot.auth.credentials.load_credentials"
-LOAD_CREDS_HELPERS = "ragnarbot.agent.tools.secrets_helpers.load_credentials"
 SAVE_CREDS = "ragnarbot.auth.credentials.save_credentials"
 
 
@@ -43,14 +42,27 @@ def mock_agent():
 
 
 @pytest.fixture
-def config_tool(mock_agent):
-    return ConfigTool(agent=mock_agent)
+def make_tool(mock_agent):
+    """Build a ConfigTool backed by in-memory config and credentials."""
+    def _make(config: Config | None = None, creds: Credentials | None = None) -> ConfigTool:
+        config = config if config is not None else Config()
+        creds = creds if creds is not None else Credentials()
+        return ConfigTool(
+            agent=mock_agent,
+            config_source=lambda: config,
+            creds_source=lambda: creds,
+        )
+    return _make
+
+
+@pytest.fixture
+def config_tool(make_tool):
+    return make_tool()
 
 
 @pytest.mark.asyncio
 async def test_schema_action_returns_all_fields(config_tool):
-    with patch(LOAD_CONFIG, return_value=Config()):
-        result = await config_tool.execute(action="schema")
+    result = await config_tool.execute(action="schema")
     assert "agents.defaults.stream_steps" in result
     assert "agents.defaults.reasoning_level" in result
     assert "agents.defaults.lightning_mode" in result
@@ -60,16 +72,22 @@ async def test_schema_action_returns_all_fields(config_tool):
 
 @pytest.mark.asyncio
 async def test_schema_action_filter_by_path(config_tool):
-    with patch(LOAD_CONFIG, return_value=Config()):
-        result = await config_tool.execute(action="schema", path="tools.web")
+    result = await config_tool.execute(action="schema", path="tools.web")
     assert "tools.web.search.engine" in result
     assert "agents.defaults" not in result
 
 
+def test_paths_with_prefix_matches_startswith_filter():
+    paths = sorted(get_all_paths(Config()))
+    for prefix in ("tools.web", "agents.defaults.m", "gateway", "zzz", ""):
+        assert _paths_with_prefix(paths, prefix) == [
+            p for p in paths if p.startswith(prefix)
+        ]
+
+
 @pytest.mark.asyncio
 async def test_get_action_returns_value(config_tool):
-    with patch(LOAD_CONFIG, return_value=Config()):
-        result = await config_tool.execute(action="get", path="agents.defaults.debounce_seconds")
+    result = await config_tool.execute(action="get", path="agents.defaults.debounce_seconds")
     data = json.loads(result)
     assert data["value"] == 0.5
     assert data["reload"] == "hot"
@@ -83,10 +101,7 @@ async def test_get_action_missing_path(config_tool):
 
 @pytest.mark.asyncio
 async def test_set_action_saves_and_hot_reloads(config_tool, mock_agent):
-    with (
-        patch(LOAD_CONFIG, return_value=Config()),
-        patch(SAVE_CONFIG),
-    ):
+    with patch(SAVE_CONFIG):
         result = await config_tool.execute(
             action="set", path="agents.defaults.debounce_seconds", value="1.0"
         )
@@ -98,10 +113,7 @@ async def test_set_action_saves_and_hot_reloads(config_tool, mock_agent):
 
 @pytest.mark.asyncio
 async def test_set_action_hot_reloads_steering_mode(config_tool, mock_agent):
-    with (
-        patch(LOAD_CONFIG, return_value=Config()),
-        patch(SAVE_CONFIG),
-    ):
+    with patch(SAVE_CONFIG):
         result = await config_tool.execute(
             action="set", path="agents.defaults.steering_enabled", value="false",
         )
@@ -114,10 +126,7 @@ async def test_set_action_hot_reloads_steering_mode(config_tool, mock_agent):
 
 @pytest.mark.asyncio
 async def test_set_action_hot_reloads_reasoning_level(config_tool, mock_agent):
-    with (
-        patch(LOAD_CONFIG, return_value=Config()),
-        patch(SAVE_CONFIG),
-    ):
+    with patch(SAVE_CONFIG):
         result = await config_tool.execute(
             action="set", path="agents.defaults.reasoning_level", value="ultra",
         )
@@ -130,10 +139,7 @@ async def test_set_action_hot_reloads_reasoning_level(config_tool, mock_agent):
 
 @pytest.mark.asyncio
 async def test_set_action_hot_reloads_lightning_mode(config_tool, mock_agent):
-    with (
-        patch(LOAD_CONFIG, return_value=Config()),
-        patch(SAVE_CONFIG),
-    ):
+    with patch(SAVE_CONFIG):
         result = await config_tool.execute(
             action="set", path="agents.defaults.lightning_mode", value="true",
         )
@@ -145,19 +151,14 @@ async def test_set_action_hot_reloads_lightning_mode(config_tool, mock_agent):
 
 
 @pytest.mark.asyncio
-async def test_set_action_warm_field(config_tool):
+async def test_set_action_warm_field(make_tool):
     creds = Credentials(
         providers=ProvidersCredentials(
             openai=ProviderCredentials(api_key="sk-openai-test"),
         ),
     )
-    with (
-        patch(LOAD_CONFIG, return_value=Config()),
-        patch(SAVE_CONFIG),
-        patch(LOAD_CREDS, return_value=creds),
-        patch(LOAD_CREDS_HELPERS, return_value=creds),
-    ):
-        result = await config_tool.execute(
+    with patch(SAVE_CONFIG):
+        result = await make_tool(creds=creds).execute(
             action="set", path="agents.defaults.model", value="openai/gpt-5.4"
         )
 
@@ -168,20 +169,18 @@ async def test_set_action_warm_field(config_tool):
 
 @pytest.mark.asyncio
 async def test_set_model_rejects_unknown(config_tool):
-    with patch(LOAD_CONFIG, return_value=Config()):
-        result = await config_tool.execute(
-            action="set", path="agents.defaults.model", value="openai/gpt-4"
-        )
+    result = await config_tool.execute(
+        action="set", path="agents.defaults.model", value="openai/gpt-4"
+    )
     assert "Error" in result
     assert "not available" in result
 
 
 @pytest.mark.asyncio
 async def test_set_action_rejects_invalid(config_tool):
-    with patch(LOAD_CONFIG, return_value=Config()):
-        result = await config_tool.execute(
-            action="set", path="agents.defaults.context_mode", value="invalid"
-        )
+    result = await config_tool.execute(
+        action="set", path="agents.defaults.context_mode", value="invalid"
+    )
     assert "Error" in result
 
 
@@ -193,57 +192,93 @@ async def test_set_action_missing_value(config_tool):
 
 @pytest.mark.asyncio
 async def test_list_action_returns_full_config(config_tool):
-    with patch(LOAD_CONFIG, return_value=Config()):
-        result = await config_tool.execute(action="list")
+    result = await config_tool.execute(action="list")
     assert "agents.defaults.debounce_seconds = 0.5" in result
     assert "gateway.port = 18790" in result
 
 
 @pytest.mark.asyncio
 async def test_diff_action_default_config(config_tool):
-    with patch(LOAD_CONFIG, return_value=Config()):
-        result = await config_tool.execute(action="diff")
+    result = await config_tool.execute(action="diff")
     assert "defaults" in result.lower()
 
 
 @pytest.mark.asyncio
-async def test_diff_action_shows_differences(config_tool):
+async def test_diff_action_shows_differences(make_tool):
     config = Config()
     config.agents.defaults.debounce_seconds = 2.0
 
-    with patch(LOAD_CONFIG, return_value=config):
-        result = await config_tool.execute(action="diff")
+    result = await make_tool(config=config).execute(action="diff")
     assert "debounce_seconds" in result
     assert "2.0" in result
 
 
+def test_default_config_returns_independent_copies(monkeypatch):
+    monkeypatch.delenv("RAGNARBOT_PROFILE", raising=False)
+    default = default_config()
+    default.agents.defaults.debounce_seconds = 99.0
+
+    fresh = default_config()
+    assert fresh is not default
+    assert fresh.agents.defaults.debounce_seconds == Config().agents.defaults.debounce_seconds
+
+
+def test_default_config_follows_profile_and_env(monkeypatch):
+    monkeypatch.delenv("RAGNARBOT_PROFILE", raising=False)
+    default_config()
+
+    monkeypatch.setenv("RAGNARBOT_PROFILE", "vodichezka")
+    assert default_config().agents.defaults.workspace == Config().agents.defaults.workspace
+
+    monkeypatch.setenv("RAGNARBOT_AGENTS__DEFAULTS__DEBOUNCE_SECONDS", "7.5")
+    assert default_config().agents.defaults.debounce_seconds == 7.5
+
+
+def test_load_config_cached_reuses_parse_until_saved(tmp_path, monkeypatch):
+    path = tmp_path / "config.json"
+    monkeypatch.setattr(loader, "get_config_path", lambda: path)
+    loader.save_config(Config())
+
+    first = loader.load_config_cached()
+    first.agents.defaults.debounce_seconds = 9.0
+    with patch.object(loader, "load_config", wraps=loader.load_config) as load:
+        assert loader.load_config_cached().agents.defaults.debounce_seconds != 9.0
+        assert load.call_count == 0
+
+        loader.save_config(first)
+        assert loader.load_config_cached().agents.defaults.debounce_seconds == 9.0
+        assert load.call_count == 1
+
+
+def test_config_tool_reads_through_cached_loader(mock_agent, monkeypatch):
+    config = Config()
+    monkeypatch.setattr(loader, "load_config_cached", lambda: config)
+    assert ConfigTool(agent=mock_agent)._load_config() is config
+
+
 # --- Secrets integration tests ---
 
 
 @pytest.mark.asyncio
-async def test_get_secret_returns_value(config_tool):
+async def test_get_secret_returns_value(make_tool):
     creds = Credentials(
         providers=ProvidersCredentials(
             anthropic=ProviderCredentials(api_key="sk-ant-test"),
         ),
     )
-    with patch(LOAD_CREDS, return_value=creds):
-        result = await config_tool.execute(
-            action="get", path="secrets.providers.anthropic.api_key"
-        )
+    result = await make_tool(creds=creds).execute(
+        action="get", path="secrets.providers.anthropic.api_key"
+    )
     data = json.loads(result)
     assert data["value"] == "sk-ant-test"
     assert data["reload"] == "warm"
 
 
 @pytest.mark.asyncio
-async def test_set_secret_saves_credentials(config_tool):
+async def test_set_secret_saves_credentials(make_tool):
     creds = Credentials()
-    with (
-        patch(LOAD_CREDS, return_value=creds),
-        patch(SAVE_CREDS) as mock_save,
-    ):
-        result = await config_tool.execute(
+    with patch(SAVE_CREDS) as mock_save:
+        result = await make_tool(creds=creds).execute(
             action="set", path="secrets.extra.github_token", value="ghp_xxx"
         )
     data = json.loads(result)
@@ -254,63 +289,48 @@ async def test_set_secret_saves_credentials(config_tool):
 
 
 @pytest.mark.asyncio
-async def test_list_includes_secrets(config_tool):
+async def test_list_includes_secrets(make_tool):
     creds = Credentials(
         providers=ProvidersCredentials(
             anthropic=ProviderCredentials(api_key="sk-ant-test"),
         ),
     )
-    with (
-        patch(LOAD_CONFIG, return_value=Config()),
-        patch(LOAD_CREDS, return_value=creds),
-    ):
-        result = await config_tool.execute(action="list")
+    result = await make_tool(creds=creds).execute(action="list")
     assert "secrets.providers.anthropic.api_key = ****" in result
     assert "secrets.providers.anthropic.oauth_key = [not set]" in result
 
 
 @pytest.mark.asyncio
-async def test_schema_includes_secrets(config_tool):
+async def test_schema_includes_secrets(make_tool):
     creds = Credentials(
         providers=ProvidersCredentials(
             anthropic=ProviderCredentials(api_key="sk-ant-test"),
         ),
     )
-    with (
-        patch(LOAD_CONFIG, return_value=Config()),
-        patch(LOAD_CREDS, return_value=creds),
-    ):
-        result = await config_tool.execute(action="schema")
+    result = await make_tool(creds=creds).execute(action="schema")
     assert "secrets.providers.anthropic.api_key [set \u2713]" in result
 
 
 @pytest.mark.asyncio
-async def test_schema_secrets_only(config_tool):
+async def test_schema_secrets_only(make_tool):
     creds = Credentials()
-    with patch(LOAD_CREDS, return_value=creds):
-        result = await config_tool.execute(action="schema", path="secrets")
+    result = await make_tool(creds=creds).execute(action="schema", path="secrets")
     assert "secrets.providers" in result
     assert "agents.defaults" not in result
 
 
 @pytest.mark.asyncio
 async def test_diff_excludes_secrets(config_tool):
-    with patch(LOAD_CONFIG, return_value=Config()):
-        result = await config_tool.execute(action="diff")
+    result = await config_tool.execute(action="diff")
     assert "Secrets excluded from diff" in result
 
 
 @pytest.mark.asyncio
-async def test_set_config_blocked_by_missing_credential(config_tool):
+async def test_set_config_blocked_by_missing_credential(make_tool):
     creds = Credentials()
-    with (
-        patch(LOAD_CONFIG, return_value=Config()),
-        patch(LOAD_CREDS, return_value=creds),
-        patch(LOAD_CREDS_HELPERS, return_value=creds),
-    ):
-        result = await config_tool.execute(
-            action="set", path="agents.defaults.model", value="gemini/gemini-3-pro-preview"
-        )
+    result = await make_tool(creds=creds).execute(
+        action="set", path="agents.defaults.model", value="gemini/gemini-3-pro-preview"
+    )
     assert "Error" in result
     assert "gemini" in result
 
@@ -319,7 +339,7 @@ async def test_set_config_blocked_by_missing_credential(config_tool):
 
 
 @pytest.mark.asyncio
-async def test_set_fallback_model_with_api_key_different_from_primary(config_tool):
+async def test_set_fallback_model_with_api_key_different_from_primary(make_tool):
     """Primary uses OAuth, fallback uses api_key with correct credentials — should pass."""
     creds = Credentials(
         providers=ProvidersCredentials(
@@ -329,13 +349,8 @@ async def test_set_fallback_model_with_api_key_different_from_primary(config_too
     )
     config = Config()
     config.agents.defaults.auth_method = "oauth"
-    with (
-        patch(LOAD_CONFIG, return_value=config),
-        patch(SAVE_CONFIG),
-        patch(LOAD_CREDS, return_value=creds),
-        patch(LOAD_CREDS_HELPERS, return_value=creds),
-    ):
-        result = await config_tool.execute(
+    with patch(SAVE_CONFIG):
+        result = await make_tool(config=config, creds=creds).execute(
             action="set", path="agents.fallback.model",
             value="gemini/gemini-3-pro-preview",
         )
@@ -344,7 +359,7 @@ async def test_set_fallback_model_with_api_key_different_from_primary(config_too
 
 
 @pytest.mark.asyncio
-async def test_set_fallback_model_rejects_missing_credential(config_tool):
+async def test_set_fallback_model_rejects_missing_credential(make_tool):
     """Fallback auth_method is api_key but no api_key for Gemini — should fail."""
     creds = Credentials(
         providers=ProvidersCredentials(
@@ -353,21 +368,16 @@ async def test_set_fallback_model_rejects_missing_credential(config_tool):
     )
     config = Config()
     config.agents.defaults.auth_method = "oauth"
-    with (
-        patch(LOAD_CONFIG, return_value=config),
-        patch(LOAD_CREDS, return_value=creds),
-        patch(LOAD_CREDS_HELPERS, return_value=creds),
-    ):
-        result = await config_tool.execute(
-            action="set", path="agents.fallback.model",
-            value="gemini/gemini-3-pro-preview",
-        )
+    result = await make_tool(config=config, creds=creds).execute(
+        action="set", path="agents.fallback.model",
+        value="gemini/gemini-3-pro-preview",
+    )
     assert "Error" in result
     assert "gemini" in result.lower()
 
 
 @pytest.mark.asyncio
-async def test_set_fallback_auth_validates_against_fallback_model(config_tool):
+async def test_set_fallback_auth_validates_against_fallback_model(make_tool):
     """Changing fallback auth_method validates against fallback model, not primary."""
     creds = Credentials(
         providers=ProvidersCredentials(
@@ -378,13 +388,8 @@ async def test_set_fallback_auth_validates_against_fallback_model(config_tool):
     config = Config()
     config.agents.fallback.model = "gemini/gemini-3-pro-preview"
     config.agents.fallback.auth_method = "api_key"
-    with (
-        patch(LOAD_CONFIG, return_value=config),
-        patch(SAVE_CONFIG),
-        patch(LOAD_CREDS, return_value=creds),
-        patch(LOAD_CREDS_HELPERS, return_value=creds),
-    ):
-        result = await config_tool.execute(
+    with patch(SAVE_CONFIG):
+        result = await make_tool(config=config, creds=creds).execute(
             action="set", path="agents.fallback.auth_method", value="api_key",
         )
     data = json.loads(result)
@@ -392,7 +397,7 @@ async def test_set_fallback_auth_validates_against_fallback_model(config_tool):
 
 
 @pytest.mark.asyncio
-async def test_set_fallback_auth_rejects_oauth_without_creds(config_tool):
+async def test_set_fallback_auth_rejects_oauth_without_creds(make_tool):
     """Changing fallback to oauth but no oauth creds for that provider — should fail."""
     creds = Credentials(
         providers=ProvidersCredentials(
@@ -402,12 +407,8 @@ async def test_set_fallback_auth_rejects_oauth_without_creds(config_tool):
     config = Config()
     config.agents.fallback.model = "gemini/gemini-3-pro-preview"
     config.agents.fallback.auth_method = "api_key"
-    with (
-        patch(LOAD_CONFIG, return_value=config),
-        patch(LOAD_CREDS, return_value=creds),
-        patch("ragnarbot.auth.gemini_oauth.is_authenticated", return_value=False),
-    ):
-        result = await config_tool.execute(
+    with patch("ragnarbot.auth.gemini_oauth.is_authenticated", return_value=False):
+        result = await make_tool(config=config, creds=creds).execute(
             action="set", path="agents.fallback.auth_method", value="oauth",
         )
     assert "Error" in result
@@ -415,7 +416,7 @@ async def test_set_fallback_auth_rejects_oauth_without_creds(config_tool):
 
 
 @pytest.mark.asyncio
-async def test_set_primary_auth_validates_credentials(config_tool):
+async def test_set_primary_auth_validates_credentials(make_tool):
     """Changing primary auth_method checks credentials for that method."""
     creds = Credentials(
         providers=ProvidersCredentials(
@@ -424,12 +425,8 @@ async def test_set_primary_auth_validates_credentials(config_tool):
     )
     config = Config()
     config.agents.defaults.auth_method = "oauth"
-    with (
-        patch(LOAD_CONFIG, return_value=config),
-        patch(LOAD_CREDS, return_value=creds),
-    ):
-        result = await config_tool.execute(
-            action="set", path="agents.defaults.auth_method", value="api_key",
-        )
+    result = await make_tool(config=config, creds=creds).execute(
+        action="set", path="agents.defaults.auth_method", value="api_key",
+    )
     assert "Error" in result
     assert "api key" in result.lower() or "API key" in result
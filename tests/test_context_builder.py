@@ -105,6 +105,20 @@ class TestIsolatedBuiltins:
 
         assert f"**Workspace:** {cb.workspace.expanduser().resolve()}" in result
         assert "absolute path under the workspace above" in result
+        assert "**Job:** job" in result
+        assert "Do work" in result
+
+    def test_cron_rules_do_not_depend_on_the_run(self, tmp_path):
+        cb = ContextBuilder(tmp_path / "workspace")
+
+        rules = cb._load_builtin_cron_rules()
+        run = cb._load_builtin_cron_run({"job_name": "job", "task_message": "Do work"})
+
+        assert "deliver_result" in rules
+        assert "{" not in rules
+        assert "**Job:** job" in run
+        assert "Do work" in run
+        assert "deliver_result" not in run
 
     def test_heartbeat_isolated_includes_workspace_path(self, tmp_path):
         cb = ContextBuilder(tmp_path / "workspace")
@@ -61,6 +61,18 @@ async def test_at_past_datetime_returns_error(cron_tool):
     assert len(cron_tool._cron.list_jobs()) == 0
 
 
+@pytest.mark.asyncio
+async def test_at_past_aware_datetime_returns_error(cron_tool):
+    """A past 'at' with an explicit UTC offset is rejected too."""
+    past = (
+        datetime.datetime.now(datetime.timezone(timedelta(hours=5)))
+        - timedelta(minutes=1)
+    ).isoformat()
+    result = await cron_tool.execute(action="add", message="too late", at=past)
+    assert "Error" in result
+    assert "+05:00" in result
+
+
 @pytest.mark.asyncio
 async def test_at_future_datetime_succeeds(cron_tool):
     """Scheduling with 'at' in the future should work."""
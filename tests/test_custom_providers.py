@@ -7,6 +7,7 @@ from unittest.mock import AsyncMock, MagicMock
 import pytest
 from aiohttp import web
 
+from ragnarbot.agent.fallback import FallbackState
 from ragnarbot.agent.loop import AgentLoop
 from ragnarbot.agent.tools.config_tool import ConfigTool
 from ragnarbot.auth.credentials import load_credentials, save_credentials
@@ -432,7 +433,7 @@ async def test_probe_reports_error_when_body_not_json(monkeypatch):
 
 # ── AgentLoop.switch_model hot swap ──────────────────────────────
 
-def _make_switchable_agent(tmp_path):
+def _make_switchable_agent(tmp_path, monkeypatch):
     """Build a real AgentLoop wired to a factory that returns a fresh provider."""
     old_model = "openai/gpt-5.6-sol"
     primary = MagicMock()
@@ -456,15 +457,14 @@ def _make_switchable_agent(tmp_path):
         provider_factory=provider_factory,
     )
     # Simulate an active fallback so success can be shown to reset it.
-    agent._fallback_state.save = MagicMock()
-    agent._fallback_state.consecutive_failures = 3
-    agent._fallback_state.fallback_mode = True
+    monkeypatch.setattr(FallbackState, "save", MagicMock())
+    agent._fallback_state = FallbackState(consecutive_failures=3, fallback_mode=True)
     return agent, primary, new_provider, provider_factory, old_model
 
 
-def test_switch_model_repoints_every_component(tmp_path):
+def test_switch_model_repoints_every_component(tmp_path, monkeypatch):
     """A successful switch rebuilds the provider and repoints all consumers."""
-    agent, primary, new_provider, _, _ = _make_switchable_agent(tmp_path)
+    agent, primary, new_provider, _, _ = _make_switchable_agent(tmp_path, monkeypatch)
     new_model = "anthropic/claude-opus-4-8"
 
     assert agent.switch_model(new_model, "api_key") is None
@@ -482,9 +482,9 @@ def test_switch_model_repoints_every_component(tmp_path):
     assert agent._fallback_state.fallback_mode is False
 
 
-def test_switch_model_keeps_old_provider_when_factory_raises(tmp_path):
+def test_switch_model_keeps_old_provider_when_factory_raises(tmp_path, monkeypatch):
     """A factory failure returns an error and leaves every consumer untouched."""
-    agent, primary, _, _, old_model = _make_switchable_agent(tmp_path)
+    agent, primary, _, _, old_model = _make_switchable_agent(tmp_path, monkeypatch)
 
     def boom(model, auth):
         raise RuntimeError("no route to host")
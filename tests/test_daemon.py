@@ -1,6 +1,7 @@
 """Tests for the daemon management module."""
 
 import os
+import plistlib
 import subprocess
 import sys
 from pathlib import Path
@@ -8,7 +9,10 @@ from unittest.mock import patch
 
 import pytest
 
+from ragnarbot.config.schema import Config
+from ragnarbot.daemon import get_manager
 from ragnarbot.daemon.base import DaemonError, DaemonInfo, DaemonStatus
+from ragnarbot.daemon.launchd import LaunchdManager
 from ragnarbot.daemon.resolve import (
     UnsupportedPlatformError,
     _probe_path_helper,
@@ -23,6 +27,7 @@ from ragnarbot.daemon.resolve import (
     resolve_path,
     service_cli_args,
 )
+from ragnarbot.daemon.systemd import SystemdManager
 
 
 @pytest.fixture(autouse=True)
@@ -31,6 +36,12 @@ def default_profile(monkeypatch):
 
 
 class TestDetectPlatform:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        detect_platform.cache_clear()
+        yield
+        detect_platform.cache_clear()
+
     def test_macos(self):
         with patch.object(sys, "platform", "darwin"):
             assert detect_platform() == "macos"
@@ -44,11 +55,23 @@ class TestDetectPlatform:
             with pytest.raises(UnsupportedPlatformError):
                 detect_platform()
 
+    def test_result_cached(self):
+        with patch.object(sys, "platform", "linux"):
+            assert detect_platform() == "linux"
+        with patch.object(sys, "platform", "darwin"):
+            assert detect_platform() == "linux"
+
 
 class TestResolveExecutable:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        resolve_executable.cache_clear()
+        yield
+        resolve_executable.cache_clear()
+
     def test_which_found(self):
         with patch("ragnarbot.daemon.resolve.shutil.which", return_value="/usr/local/bin/ragnarbot"):
-            assert resolve_executable() == ["/usr/local/bin/ragnarbot"]
+            assert resolve_executable() == ("/usr/local/bin/ragnarbot",)
 
     def test_sibling_found(self, tmp_path):
         fake_python = tmp_path / "python3"
@@ -60,7 +83,7 @@ class TestResolveExecutable:
             patch("ragnarbot.daemon.resolve.shutil.which", return_value=None),
             patch("ragnarbot.daemon.resolve.sys.executable", str(fake_python)),
         ):
-            assert resolve_executable() == [str(sibling)]
+            assert resolve_executable() == (str(sibling),)
 
     def test_module_fallback(self, tmp_path):
         fake_python = tmp_path / "python3"
@@ -71,7 +94,22 @@ class TestResolveExecutable:
             patch("ragnarbot.daemon.resolve.sys.executable", str(fake_python)),
         ):
             result = resolve_executable()
-            assert result == [str(fake_python), "-m", "ragnarbot"]
+            assert result == (str(fake_python), "-m", "ragnarbot")
+
+    def test_result_cached_until_path_changes(self, monkeypatch):
+        monkeypatch.setenv("PATH", "/usr/bin")
+        monkeypatch.setattr("ragnarbot.daemon.resolve._probe_login_shell", lambda: ["/new/bin"])
+        monkeypatch.setattr("ragnarbot.daemon.resolve._probe_path_helper", lambda: [])
+        monkeypatch.setattr("ragnarbot.daemon.resolve._well_known_dirs", lambda: ())
+
+        with patch("ragnarbot.daemon.resolve.shutil.which", return_value="/a/ragnarbot") as which:
+            assert resolve_executable() == ("/a/ragnarbot",)
+            assert resolve_executable() == ("/a/ragnarbot",)
+            assert which.call_count == 1
+
+            resolve_path()
+            resolve_executable()
+            assert which.call_count == 2
 
 
 class TestGetLogDir:
@@ -103,25 +141,17 @@ class TestDaemonInfo:
 class TestGetManager:
     def test_macos_returns_launchd(self):
         with patch("ragnarbot.daemon.detect_platform", return_value="macos"):
-            from ragnarbot.daemon import get_manager
-            from ragnarbot.daemon.launchd import LaunchdManager
             manager = get_manager()
             assert isinstance(manager, LaunchdManager)
 
     def test_linux_returns_systemd(self):
         with patch("ragnarbot.daemon.detect_platform", return_value="linux"):
-            from ragnarbot.daemon import get_manager
-            from ragnarbot.daemon.systemd import SystemdManager
             manager = get_manager()
             assert isinstance(manager, SystemdManager)
 
 
 class TestLaunchdManager:
     def test_install_creates_plist(self, tmp_path):
-        import plistlib
-
-        from ragnarbot.daemon.launchd import LaunchdManager
-
         plist_path = tmp_path / "com.ragnarbot.gateway.plist"
         log_dir = tmp_path / "logs"
 
@@ -144,8 +174,6 @@ class TestLaunchdManager:
         assert plist["KeepAlive"] is True
 
     def test_uninstall_removes_plist(self, tmp_path):
-        from ragnarbot.daemon.launchd import LaunchdManager
-
         plist_path = tmp_path / "com.ragnarbot.gateway.plist"
         plist_path.touch()
 
@@ -156,8 +184,6 @@ class TestLaunchdManager:
         assert not plist_path.exists()
 
     def test_is_installed(self, tmp_path):
-        from ragnarbot.daemon.launchd import LaunchdManager
-
         plist_path = tmp_path / "com.ragnarbot.gateway.plist"
 
         with patch("ragnarbot.daemon.launchd.get_launchd_plist_path", return_value=plist_path):
@@ -167,8 +193,6 @@ class TestLaunchdManager:
             assert manager.is_installed()
 
     def test_status_not_installed(self, tmp_path):
-        from ragnarbot.daemon.launchd import LaunchdManager
-
         plist_path = tmp_path / "com.ragnarbot.gateway.plist"
         with patch("ragnarbot.daemon.launchd.get_launchd_plist_path", return_value=plist_path):
             manager = LaunchdManager()
@@ -176,8 +200,6 @@ class TestLaunchdManager:
             assert info.status == DaemonStatus.NOT_INSTALLED
 
     def test_start_raises_if_not_installed(self, tmp_path):
-        from ragnarbot.daemon.launchd import LaunchdManager
-
         plist_path = tmp_path / "com.ragnarbot.gateway.plist"
         with patch("ragnarbot.daemon.launchd.get_launchd_plist_path", return_value=plist_path):
             manager = LaunchdManager()
@@ -192,8 +214,6 @@ class TestLaunchdManager:
 
 class TestSystemdManager:
     def test_install_creates_unit(self, tmp_path):
-        from ragnarbot.daemon.systemd import SystemdManager
-
         unit_path = tmp_path / "ragnarbot-gateway.service"
 
         with (
@@ -210,11 +230,9 @@ class TestSystemdManager:
         content = unit_path.read_text()
         assert "ExecStart=/usr/bin/ragnarbot --profile default gateway" in content
         assert "Restart=on-failure" in content
-        assert mock_ctl.call_count == 2  # daemon-reload + enable
+        mock_ctl.assert_called_once_with("enable", "ragnarbot-gateway.service")
 
     def test_is_installed(self, tmp_path):
-        from ragnarbot.daemon.systemd import SystemdManager
-
         unit_path = tmp_path / "ragnarbot-gateway.service"
 
         with patch("ragnarbot.daemon.systemd.get_systemd_unit_path", return_value=unit_path):
@@ -224,8 +242,6 @@ class TestSystemdManager:
             assert manager.is_installed()
 
     def test_status_not_installed(self, tmp_path):
-        from ragnarbot.daemon.systemd import SystemdManager
-
         unit_path = tmp_path / "ragnarbot-gateway.service"
         with patch("ragnarbot.daemon.systemd.get_systemd_unit_path", return_value=unit_path):
             manager = SystemdManager()
@@ -233,8 +249,6 @@ class TestSystemdManager:
             assert info.status == DaemonStatus.NOT_INSTALLED
 
     def test_start_raises_if_not_installed(self, tmp_path):
-        from ragnarbot.daemon.systemd import SystemdManager
-
         unit_path = tmp_path / "ragnarbot-gateway.service"
         with patch("ragnarbot.daemon.systemd.get_systemd_unit_path", return_value=unit_path):
             manager = SystemdManager()
@@ -253,121 +267,138 @@ def test_service_cli_args():
 
 class TestDaemonConfig:
     def test_default_disabled(self):
-        from ragnarbot.config.schema import Config
         config = Config()
         assert config.daemon.enabled is False
 
     def test_set_enabled(self):
-        from ragnarbot.config.schema import Config
         config = Config()
         config.daemon.enabled = True
         assert config.daemon.enabled is True
 
 
 class TestResolvePath:
-    def test_login_shell_paths_merged(self):
-        shell_paths = "/usr/local/bin:/opt/homebrew/bin:/custom/bin"
-        result = subprocess.CompletedProcess(args=[], returncode=0, stdout=shell_paths + "\n")
-        with patch.dict(os.environ, {"PATH": "/usr/bin:/bin", "SHELL": "/bin/zsh"}, clear=False):
-            with patch("ragnarbot.daemon.resolve.subprocess.run", return_value=result):
-                resolve_path()
-                path = os.environ["PATH"]
-                assert "/custom/bin" in path
-                assert "/opt/homebrew/bin" in path
-
-    def test_deduplication(self):
-        shell_paths = "/custom/bin:/custom/bin:/other/bin:/other/bin"
-        result = subprocess.CompletedProcess(args=[], returncode=0, stdout=shell_paths + "\n")
-        with patch.dict(os.environ, {"PATH": "/usr/bin:/bin", "SHELL": "/bin/zsh"}, clear=False):
-            with patch("ragnarbot.daemon.resolve.subprocess.run", return_value=result):
-                resolve_path()
-                path = os.environ["PATH"]
-                # Count occurrences — each new entry should appear only once
-                entries = path.split(":")
-                assert entries.count("/custom/bin") == 1
-                assert entries.count("/other/bin") == 1
-
-    def test_shell_probe_failure_falls_through(self):
-        with patch.dict(os.environ, {"PATH": "/usr/bin:/bin", "SHELL": "/bin/zsh"}, clear=False):
-            with patch(
-                "ragnarbot.daemon.resolve.subprocess.run",
-                side_effect=OSError("no shell"),
-            ):
-                with patch(
-                    "ragnarbot.daemon.resolve._well_known_dirs",
-                    return_value=["/fallback/bin"],
-                ):
-                    resolve_path()
-                    assert "/fallback/bin" in os.environ["PATH"]
-
-    def test_path_helper_parsed(self):
-        helper_output = 'PATH="/helper/bin:/helper/sbin"; export PATH;\n'
-        result = subprocess.CompletedProcess(args=[], returncode=0, stdout=helper_output)
-        with patch.dict(os.environ, {"PATH": "/usr/bin", "SHELL": "/bin/zsh"}, clear=False):
-            with patch("ragnarbot.daemon.resolve.sys.platform", "darwin"):
-                with patch("ragnarbot.daemon.resolve.os.path.isfile", return_value=True):
-                    with patch("ragnarbot.daemon.resolve.subprocess.run", return_value=result):
-                        paths = _probe_path_helper()
-                        assert "/helper/bin" in paths
-                        assert "/helper/sbin" in paths
-
-    def test_well_known_dirs_only_existing(self, tmp_path):
+    @staticmethod
+    def _env(monkeypatch, path):
+        monkeypatch.setenv("PATH", path)
+        monkeypatch.setenv("SHELL", "/bin/zsh")
+
+    @staticmethod
+    def _shell_returns(monkeypatch, stdout):
+        result = subprocess.CompletedProcess(args=[], returncode=0, stdout=stdout)
+        monkeypatch.setattr("ragnarbot.daemon.resolve.subprocess.run", lambda *a, **k: result)
+
+    def test_login_shell_paths_merged(self, monkeypatch):
+        self._env(monkeypatch, "/usr/bin:/bin")
+        self._shell_returns(monkeypatch, "/usr/local/bin:/opt/homebrew/bin:/custom/bin\n")
+        resolve_path()
+        path = os.environ["PATH"]
+        assert "/custom/bin" in path
+        assert "/opt/homebrew/bin" in path
+
+    def test_deduplication(self, monkeypatch):
+        self._env(monkeypatch, "/usr/bin:/bin")
+        self._shell_returns(monkeypatch, "/custom/bin:/custom/bin:/other/bin:/other/bin\n")
+        resolve_path()
+        # Count occurrences — each new entry should appear only once
+        entries = os.environ["PATH"].split(":")
+        assert entries.count("/custom/bin") == 1
+        assert entries.count("/other/bin") == 1
+
+    def test_shell_probe_failure_falls_through(self, monkeypatch):
+        def no_shell(*args, **kwargs):
+            raise OSError("no shell")
+
+        self._env(monkeypatch, "/usr/bin:/bin")
+        monkeypatch.setattr("ragnarbot.daemon.resolve.subprocess.run", no_shell)
+        monkeypatch.setattr("ragnarbot.daemon.resolve._well_known_dirs", lambda: ["/fallback/bin"])
+        resolve_path()
+        assert "/fallback/bin" in os.environ["PATH"]
+
+    def test_path_helper_parsed(self, monkeypatch):
+        self._env(monkeypatch, "/usr/bin")
+        monkeypatch.setattr("ragnarbot.daemon.resolve.sys.platform", "darwin")
+        monkeypatch.setattr("ragnarbot.daemon.resolve.os.path.isfile", lambda _: True)
+        self._shell_returns(monkeypatch, 'PATH="/helper/bin:/helper/sbin"; export PATH;\n')
+        paths = _probe_path_helper()
+        assert "/helper/bin" in paths
+        assert "/helper/sbin" in paths
+
+    def test_path_helper_ignores_manpath(self, monkeypatch):
+        self._env(monkeypatch, "/usr/bin")
+        monkeypatch.setattr("ragnarbot.daemon.resolve.sys.platform", "darwin")
+        monkeypatch.setattr("ragnarbot.daemon.resolve.os.path.isfile", lambda _: True)
+        self._shell_returns(
+            monkeypatch,
+            'MANPATH="/usr/share/man"; export MANPATH;\n'
+            'PATH="/helper/bin"; export PATH;\n',
+        )
+        assert _probe_path_helper() == ["/helper/bin"]
+
+    def test_well_known_dirs_only_existing(self, tmp_path, monkeypatch):
         real_dir = tmp_path / "real"
         real_dir.mkdir()
         fake_dirs = [str(real_dir), "/nonexistent/fake/path"]
-        with patch("ragnarbot.daemon.resolve._WELL_KNOWN_DIRS", fake_dirs):
+        monkeypatch.setattr("ragnarbot.daemon.resolve._WELL_KNOWN_DIRS", fake_dirs)
+        _well_known_dirs.cache_clear()
+        try:
             dirs = _well_known_dirs()
-            assert str(real_dir) in dirs
-            assert "/nonexistent/fake/path" not in dirs
+        finally:
+            _well_known_dirs.cache_clear()
+        assert str(real_dir) in dirs
+        assert "/nonexistent/fake/path" not in dirs
 
-    def test_existing_path_preserved(self):
+    def test_existing_path_preserved(self, monkeypatch):
         original = "/usr/bin:/bin:/usr/sbin"
-        shell_paths = "/custom/bin"
-        result = subprocess.CompletedProcess(args=[], returncode=0, stdout=shell_paths + "\n")
-        with patch.dict(os.environ, {"PATH": original, "SHELL": "/bin/zsh"}, clear=False):
-            with patch("ragnarbot.daemon.resolve.subprocess.run", return_value=result):
-                resolve_path()
-                path = os.environ["PATH"]
-                # Original entries must still be present
-                for entry in original.split(":"):
-                    assert entry in path.split(":")
-
-    def test_new_paths_prepended(self):
-        original = "/usr/bin:/bin"
-        shell_paths = "/custom/bin"
-        result = subprocess.CompletedProcess(args=[], returncode=0, stdout=shell_paths + "\n")
-        with patch.dict(os.environ, {"PATH": original, "SHELL": "/bin/zsh"}, clear=False):
-            with patch("ragnarbot.daemon.resolve.subprocess.run", return_value=result):
-                resolve_path()
-                path = os.environ["PATH"]
-                # New paths should come before original
-                assert path.startswith("/custom/bin:")
-
-    def test_never_raises_on_total_failure(self):
-        with patch.dict(os.environ, {"PATH": "/usr/bin", "SHELL": "/bin/zsh"}, clear=False):
-            with patch(
-                "ragnarbot.daemon.resolve._probe_login_shell",
-                side_effect=Exception("boom"),
-            ):
-                # Should not raise
-                resolve_path()
-                assert "/usr/bin" in os.environ["PATH"]
-
-    def test_noop_when_nothing_discovered(self):
+        self._env(monkeypatch, original)
+        self._shell_returns(monkeypatch, "/custom/bin\n")
+        resolve_path()
+        # Original entries must still be present
+        entries = os.environ["PATH"].split(":")
+        for entry in original.split(":"):
+            assert entry in entries
+
+    def test_new_paths_prepended(self, monkeypatch):
+        self._env(monkeypatch, "/usr/bin:/bin")
+        self._shell_returns(monkeypatch, "/custom/bin\n")
+        resolve_path()
+        # New paths should come before original
+        assert os.environ["PATH"].startswith("/custom/bin:")
+
+    def test_never_raises_on_total_failure(self, monkeypatch):
+        def boom():
+            raise Exception("boom")
+
+        self._env(monkeypatch, "/usr/bin")
+        monkeypatch.setattr("ragnarbot.daemon.resolve._probe_login_shell", boom)
+        # Should not raise
+        resolve_path()
+        assert "/usr/bin" in os.environ["PATH"]
+
+    def test_noop_when_nothing_discovered(self, monkeypatch):
         original = "/usr/bin:/bin"
-        with patch.dict(os.environ, {"PATH": original, "SHELL": "/bin/zsh"}, clear=False):
-            with patch("ragnarbot.daemon.resolve._probe_login_shell", return_value=[]):
-                with patch("ragnarbot.daemon.resolve._probe_path_helper", return_value=[]):
-                    with patch("ragnarbot.daemon.resolve._well_known_dirs", return_value=[]):
-                        resolve_path()
-                        assert os.environ["PATH"] == original
-
-    def test_already_present_paths_not_duplicated(self):
+        self._env(monkeypatch, original)
+        monkeypatch.setattr("ragnarbot.daemon.resolve._probe_login_shell", lambda: [])
+        monkeypatch.setattr("ragnarbot.daemon.resolve._probe_path_helper", lambda: [])
+        monkeypatch.setattr("ragnarbot.daemon.resolve._well_known_dirs", lambda: [])
+        resolve_path()
+        assert os.environ["PATH"] == original
+
+    def test_already_present_paths_not_duplicated(self, monkeypatch):
+        self._env(monkeypatch, "/usr/bin:/opt/homebrew/bin")
+        self._shell_returns(monkeypatch, "/opt/homebrew/bin:/new/bin\n")
+        resolve_path()
+        entries = os.environ["PATH"].split(":")
+        assert entries.count("/opt/homebrew/bin") == 1
+
+    def test_path_untouched_when_everything_present(self, monkeypatch):
         original = "/usr/bin:/opt/homebrew/bin"
-        shell_paths = "/opt/homebrew/bin:/new/bin"
-        result = subprocess.CompletedProcess(args=[], returncode=0, stdout=shell_paths + "\n")
-        with patch.dict(os.environ, {"PATH": original, "SHELL": "/bin/zsh"}, clear=False):
-            with patch("ragnarbot.daemon.resolve.subprocess.run", return_value=result):
-                resolve_path()
-                entries = os.environ["PATH"].split(":")
-                assert entries.count("/opt/homebrew/bin") == 1
+        self._env(monkeypatch, original)
+        self._shell_returns(monkeypatch, "/opt/homebrew/bin:/usr/bin\n")
+        monkeypatch.setattr("ragnarbot.daemon.resolve._probe_path_helper", lambda: [])
+        monkeypatch.setattr("ragnarbot.daemon.resolve._well_known_dirs", lambda: ())
+        monkeypatch.setattr(
+            "ragnarbot.daemon.resolve.resolve_executable.cache_clear",
+            lambda: pytest.fail("PATH was rewritten"),
+        )
+        resolve_path()
+        assert os.environ["PATH"] == original
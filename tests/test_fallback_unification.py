@@ -1,5 +1,7 @@
 """Tests for unified fallback support across all LLM call sites."""
 
+from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -12,6 +14,33 @@ from ragnarbot.agent.subagent import SubagentManager
 from ragnarbot.bus.events import InboundMessage
 from ragnarbot.config.schema import ExecToolConfig, FallbackConfig
 from ragnarbot.providers.base import LLMResponse, ToolCallRequest
+from ragnarbot.session.manager import Session
+
+
+def _returning(value):
+    """Plain async stub for chat_fn when calls are not asserted on."""
+    async def _fn(*args, **kwargs):
+        return value
+    return _fn
+
+
+@pytest.fixture(autouse=True)
+def fallback_save():
+    """Keep FallbackState.save off disk; slots rule out patching an instance."""
+    with patch.object(FallbackState, "save") as save:
+        yield save
+
+
+@pytest.fixture(scope="module")
+def prepopulated_session() -> Session:
+    """30-message session shared read-only by the compaction failure tests."""
+    session = Session(key="test", user_key="test:1")
+    session.extend_messages(
+        row for i in range(15)
+        for row in (("user", f"msg {i}"), ("assistant", f"reply {i}"))
+    )
+    return session
+
 
 # ── Compactor chat_fn tests ──────────────────────────────────────
 
@@ -59,26 +88,20 @@ class TestCompactorChatFn:
         c.provider.chat.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_compact_handles_error_response(self):
+    async def test_compact_handles_error_response(self, prepopulated_session):
         """compact() returns original messages when LLM returns error."""
-        error_fn = AsyncMock(return_value=(
+        error_fn = _returning((
             LLMResponse(content="API error", finish_reason="error"),
             True,
             "primary error",
         ))
         c = self._make_compactor(chat_fn=error_fn)
 
-        from ragnarbot.session.manager import Session
-        session = Session(key="test", user_key="test:1")
-        for i in range(15):
-            session.add_message("user", f"msg {i}")
-            session.add_message("assistant", f"reply {i}")
-
         messages = [{"role": "user", "content": "test"}] * 20
         new_start = 19
 
         result_messages, result_start, memory_segment = await c.compact(
-            session=session,
+            session=prepopulated_session,
             context_mode="normal",
             context_builder=MagicMock(),
             messages=messages,
@@ -90,22 +113,16 @@ class TestCompactorChatFn:
         assert memory_segment is None
 
     @pytest.mark.asyncio
-    async def test_compact_handles_none_response(self):
+    async def test_compact_handles_none_response(self, prepopulated_session):
         """compact() returns original messages when response is None."""
-        none_fn = AsyncMock(return_value=(None, False, None))
+        none_fn = _returning((None, False, None))
         c = self._make_compactor(chat_fn=none_fn)
 
-        from ragnarbot.session.manager import Session
-        session = Session(key="test", user_key="test:1")
-        for i in range(15):
-            session.add_message("user", f"msg {i}")
-            session.add_message("assistant", f"reply {i}")
-
         messages = [{"role": "user", "content": "test"}] * 20
         new_start = 19
 
         result_messages, result_start, memory_segment = await c.compact(
-            session=session,
+            session=prepopulated_session,
             context_mode="normal",
             context_builder=MagicMock(),
             messages=messages,
@@ -126,15 +143,12 @@ class TestSubagentChatFn:
     def _make_manager(self, chat_fn=None, on_fallback_batch=None):
         provider = AsyncMock()
         provider.get_default_model.return_value = "test/model"
-        bus = MagicMock()
-        bus.publish_inbound = AsyncMock()
-        workspace = MagicMock()
         agents_loader = MagicMock()
         agents_loader.load_agent.return_value = None
         return SubagentManager(
             provider=provider,
-            workspace=workspace,
-            bus=bus,
+            workspace=Path("/nonexistent/workspace"),
+            bus=SimpleNamespace(publish_inbound=AsyncMock()),
             agents_loader=agents_loader,
             model="test/model",
             chat_fn=chat_fn,
@@ -203,7 +217,7 @@ class TestSubagentChatFn:
     @pytest.mark.asyncio
     async def test_fallback_batch_called_on_success(self):
         """on_fallback_batch is called when fallback was used and task succeeds."""
-        chat_fn = AsyncMock(return_value=(
+        chat_fn = _returning((
             LLMResponse(content="done"), True, "primary failed",
         ))
         on_fb = AsyncMock()
@@ -218,7 +232,7 @@ class TestSubagentChatFn:
     @pytest.mark.asyncio
     async def test_fallback_batch_called_on_error(self):
         """on_fallback_batch is called even when subagent raises RuntimeError."""
-        chat_fn = AsyncMock(return_value=(
+        chat_fn = _returning((
             LLMResponse(content="both providers failed", finish_reason="error"),
             True,
             "primary error",
@@ -238,7 +252,7 @@ class TestSubagentChatFn:
     @pytest.mark.asyncio
     async def test_no_fallback_batch_when_primary_succeeds(self):
         """on_fallback_batch is NOT called when primary was always used."""
-        chat_fn = AsyncMock(return_value=(
+        chat_fn = _returning((
             LLMResponse(content="done"), False, None,
         ))
         on_fb = AsyncMock()
@@ -295,7 +309,9 @@ class TestRecordFallbackBatch:
 
 @pytest.mark.asyncio
 @pytest.mark.parametrize("system_message", [False, True])
-async def test_fallback_stays_sticky_for_entire_interaction(tmp_path, system_message):
+async def test_fallback_stays_sticky_for_entire_interaction(
+    tmp_path, system_message, fallback_save,
+):
     """A fallback tool call must not hand the final answer back to primary."""
     primary_model = "openai/gpt-5.6-sol"
     fallback_model = "anthropic/claude-opus-4-8"
@@ -340,8 +356,6 @@ async def test_fallback_stays_sticky_for_entire_interaction(tmp_path, system_mes
             provider_factory=provider_factory,
         )
 
-    agent._fallback_state = FallbackState()
-    agent._fallback_state.save = MagicMock()
     agent._execute_tool_with_tracking = AsyncMock(return_value="tool ok")
     agent.index.start_chat_jobs = AsyncMock()
 
@@ -370,7 +384,7 @@ async def test_fallback_stays_sticky_for_entire_interaction(tmp_path, system_mes
     assert fallback.chat.await_args_list[1].kwargs["model"] == fallback_model
     assert agent._execute_tool_with_tracking.await_count == 1
     assert agent._fallback_state.consecutive_failures == 1
-    agent._fallback_state.save.assert_called_once_with()
+    fallback_save.assert_called_once_with()
 
     # The pin is interaction-local: the next interaction probes primary normally.
     if system_message:
@@ -443,8 +457,6 @@ def _make_isolated_fallback_agent(tmp_path, *, real_subagents=False):
         with patch("ragnarbot.agent.loop.SubagentManager"):
             agent = AgentLoop(**kwargs)
 
-    agent._fallback_state = FallbackState()
-    agent._fallback_state.save = MagicMock()
     return agent, primary, fallback, provider_factory, fallback_model
 
 
@@ -1,64 +1,90 @@
 """Tests for Gemini free tier cache retry logic."""
 
-import pytest
-from unittest.mock import AsyncMock, patch, MagicMock
+import copy
+from types import SimpleNamespace
+from unittest.mock import patch
 
 import litellm
+import pytest
 
 from ragnarbot.providers.litellm_provider import LiteLLMProvider
-from ragnarbot.providers.base import LLMResponse
-
-
-class TestStripCacheControl:
-    def test_removes_from_content_blocks(self):
-        messages = [
-            {"role": "system", "content": [
-                {"type": "text", "text": "You are helpful.", "cache_control": {"type": "ephemeral"}},
-            ]},
-            {"role": "user", "content": "Hi"},
-        ]
-        result = LiteLLMProvider._strip_cache_control(messages)
-        assert "cache_control" not in result[0]["content"][0]
-
-    def test_removes_from_message_level(self):
-        messages = [
-            {"role": "tool", "tool_call_id": "1", "content": "result",
-             "cache_control": {"type": "ephemeral"}},
-        ]
-        result = LiteLLMProvider._strip_cache_control(messages)
-        assert "cache_control" not in result[0]
-
-    def test_preserves_other_fields(self):
-        messages = [
-            {"role": "system", "content": [
-                {"type": "text", "text": "hello", "cache_control": {"type": "ephemeral"}},
-            ]},
-            {"role": "tool", "tool_call_id": "42", "content": "data",
-             "cache_control": {"type": "ephemeral"}},
-        ]
-        result = LiteLLMProvider._strip_cache_control(messages)
-        assert result[0]["role"] == "system"
-        assert result[0]["content"][0]["type"] == "text"
-        assert result[0]["content"][0]["text"] == "hello"
-        assert result[1]["role"] == "tool"
-        assert result[1]["tool_call_id"] == "42"
-        assert result[1]["content"] == "data"
-
-    def test_does_not_mutate_originals(self):
-        block = {"type": "text", "text": "hi", "cache_control": {"type": "ephemeral"}}
-        msg = {"role": "system", "content": [block]}
-        tool_msg = {"role": "tool", "content": "r", "cache_control": {"type": "ephemeral"}}
-        messages = [msg, tool_msg]
-
-        LiteLLMProvider._strip_cache_control(messages)
-
-        assert "cache_control" in block
-        assert "cache_control" in tool_msg
+
+_EPHEMERAL = {"type": "ephemeral"}
+
+# (input message, expected message after stripping cache_control)
+_STRIP_CASES = [
+    pytest.param(
+        {"role": "system", "content": [
+            {"type": "text", "text": "You are helpful.", "cache_control": _EPHEMERAL},
+        ]},
+        {"role": "system", "content": [{"type": "text", "text": "You are helpful."}]},
+        id="content-block",
+    ),
+    pytest.param(
+        {"role": "tool", "tool_call_id": "42", "content": "data", "cache_control": _EPHEMERAL},
+        {"role": "tool", "tool_call_id": "42", "content": "data"},
+        id="message-level",
+    ),
+    pytest.param(
+        {"role": "user", "content": "Hi"},
+        {"role": "user", "content": "Hi"},
+        id="untouched",
+    ),
+]
+
+
+@pytest.mark.parametrize("message, expected", _STRIP_CASES)
+def test_strip_cache_control(message, expected):
+    original = copy.deepcopy(message)
+
+    result = LiteLLMProvider._strip_cache_control([message])
+
+    assert result == [expected]
+    assert message == original  # input is not mutated
+
+
+def _scripted(*outcomes):
+    """acompletion stub returning (or raising) *outcomes* in order; kwargs land in .calls."""
+    pending = iter(outcomes)
+    calls: list[dict] = []
+
+    async def _acompletion(**kwargs):
+        calls.append(kwargs)
+        outcome = next(pending)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    _acompletion.calls = calls
+    return _acompletion
+
+
+@pytest.fixture(scope="module")
+def ok_response():
+    """Plain successful completion; _parse_response only reads it."""
+    return SimpleNamespace(
+        choices=[SimpleNamespace(
+            message=SimpleNamespace(content="Hello!", tool_calls=None),
+            finish_reason="stop",
+        )],
+        usage=SimpleNamespace(
+            prompt_tokens=10,
+            completion_tokens=5,
+            total_tokens=15,
+            prompt_tokens_details=None,
+        ),
+    )
 
 
 class TestGeminiFreeTrierCacheRetry:
+    @pytest.fixture(autouse=True)
+    def _vision_supported(self, monkeypatch):
+        monkeypatch.setattr(
+            "ragnarbot.config.providers.model_supports_vision", lambda model: True,
+        )
+
     @pytest.mark.asyncio
-    async def test_retries_without_cache_on_free_tier_error(self):
+    async def test_retries_without_cache_on_free_tier_error(self, ok_response):
         provider = LiteLLMProvider.__new__(LiteLLMProvider)
         provider.default_model = "gemini/gemini-2.0-flash"
 
@@ -68,21 +94,9 @@ class TestGeminiFreeTrierCacheRetry:
             llm_provider="gemini",
         )
 
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = "Hello!"
-        mock_response.choices[0].message.tool_calls = None
-        mock_response.choices[0].finish_reason = "stop"
-        mock_response.usage = MagicMock()
-        mock_response.usage.prompt_tokens = 10
-        mock_response.usage.completion_tokens = 5
-        mock_response.usage.total_tokens = 15
-        mock_response.usage.prompt_tokens_details = None
-
-        mock_acompletion = AsyncMock(side_effect=[free_tier_error, mock_response])
-
-        with patch("ragnarbot.providers.litellm_provider.acompletion", mock_acompletion), \
-             patch("ragnarbot.config.providers.model_supports_vision", return_value=True):
+        mock_acompletion = _scripted(free_tier_error, ok_response)
+
+        with patch("ragnarbot.providers.litellm_provider.acompletion", mock_acompletion):
             result = await provider.chat(
                 messages=[
                     {"role": "system", "content": "You are helpful."},
@@ -93,10 +107,10 @@ class TestGeminiFreeTrierCacheRetry:
 
         assert result.finish_reason == "stop"
         assert result.content == "Hello!"
-        assert mock_acompletion.call_count == 2
+        assert len(mock_acompletion.calls) == 2
 
         # Second call should have no cache_control in messages
-        retry_messages = mock_acompletion.call_args_list[1].kwargs["messages"]
+        retry_messages = mock_acompletion.calls[1]["messages"]
         for msg in retry_messages:
             assert "cache_control" not in msg
             content = msg.get("content")
@@ -116,10 +130,9 @@ class TestGeminiFreeTrierCacheRetry:
             llm_provider="gemini",
         )
 
-        mock_acompletion = AsyncMock(side_effect=rate_limit_error)
+        mock_acompletion = _scripted(rate_limit_error)
 
-        with patch("ragnarbot.providers.litellm_provider.acompletion", mock_acompletion), \
-             patch("ragnarbot.config.providers.model_supports_vision", return_value=True):
+        with patch("ragnarbot.providers.litellm_provider.acompletion", mock_acompletion):
             result = await provider.chat(
                 messages=[
                     {"role": "system", "content": "You are helpful."},
@@ -130,7 +143,7 @@ class TestGeminiFreeTrierCacheRetry:
 
         assert result.finish_reason == "error"
         assert "Rate limit exceeded" in result.content
-        assert mock_acompletion.call_count == 1
+        assert len(mock_acompletion.calls) == 1
 
     @pytest.mark.asyncio
     async def test_retry_failure_returns_error(self):
@@ -144,10 +157,9 @@ class TestGeminiFreeTrierCacheRetry:
         )
         second_error = Exception("Connection failed")
 
-        mock_acompletion = AsyncMock(side_effect=[free_tier_error, second_error])
+        mock_acompletion = _scripted(free_tier_error, second_error)
 
-        with patch("ragnarbot.providers.litellm_provider.acompletion", mock_acompletion), \
-             patch("ragnarbot.config.providers.model_supports_vision", return_value=True):
+        with patch("ragnarbot.providers.litellm_provider.acompletion", mock_acompletion):
             result = await provider.chat(
                 messages=[
                     {"role": "system", "content": "You are helpful."},
@@ -158,4 +170,4 @@ class TestGeminiFreeTrierCacheRetry:
 
         assert result.finish_reason == "error"
         assert "Connection failed" in result.content
-        assert mock_acompletion.call_count == 2
+        assert len(mock_acompletion.calls) == 2
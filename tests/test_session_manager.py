@@ -0,0 +1,36 @@
+"""Tests for SessionManager persistence."""
+
+import math
+
+from ragnarbot.session.manager import SessionManager
+
+
+class TestSessionManagerLoad:
+    def test_saved_session_round_trips(self, tmp_path):
+        sessions = SessionManager(tmp_path)
+        session = sessions.create_new("telegram:42")
+        session.add_message("user", "héllo ✓")
+        session.add_message("assistant", "hi")
+        session.metadata["score"] = float("nan")
+        sessions.save(session)
+
+        loaded = SessionManager(tmp_path).get_by_id(session.key)
+
+        assert loaded is not None
+        assert loaded.user_key == "telegram:42"
+        assert [m["content"] for m in loaded.messages] == ["héllo ✓", "hi"]
+        assert math.isnan(loaded.metadata["score"])
+
+    def test_big_ints_survive_load_and_resave(self, tmp_path):
+        sessions = SessionManager(tmp_path)
+        session = sessions.create_new("telegram:42")
+        session.metadata["counter"] = 2**70
+        sessions.save(session)
+
+        loaded = SessionManager(tmp_path).get_by_id(session.key)
+        assert loaded.metadata["counter"] == 2**70
+        assert isinstance(loaded.metadata["counter"], int)
+
+        SessionManager(tmp_path).save(loaded)
+        reloaded = SessionManager(tmp_path).get_by_id(session.key)
+        assert reloaded.metadata["counter"] == 2**70
@@ -10,7 +10,13 @@ from ragnarbot.auth.credentials import (
     ProvidersCredentials,
 )
 from ragnarbot.cli.commands import _validate_auth
-from ragnarbot.config.schema import Config
+from ragnarbot.config.schema import default_config
+
+
+@pytest.fixture
+def config():
+    """Mutable copy of the cached default Config; cheaper than Config()."""
+    return default_config()
 
 
 @pytest.fixture
@@ -33,32 +39,28 @@ def mixed_creds():
     )
 
 
-def test_primary_only_valid(anthropic_oauth_creds):
-    config = Config()
+def test_primary_only_valid(anthropic_oauth_creds, config):
     config.agents.defaults.auth_method = "oauth"
     assert _validate_auth(config, anthropic_oauth_creds) is None
 
 
-def test_primary_and_fallback_different_providers_valid(mixed_creds):
+def test_primary_and_fallback_different_providers_valid(mixed_creds, config):
     """Issue #70: primary=Anthropic/OAuth, fallback=Gemini/api_key — should pass."""
-    config = Config()
     config.agents.defaults.auth_method = "oauth"
     config.agents.fallback.model = "gemini/gemini-3-pro-preview"
     config.agents.fallback.auth_method = "api_key"
     assert _validate_auth(config, mixed_creds) is None
 
 
-def test_fallback_no_model_skips_validation(anthropic_oauth_creds):
+def test_fallback_no_model_skips_validation(anthropic_oauth_creds, config):
     """No fallback model configured — should not trigger fallback validation."""
-    config = Config()
     config.agents.defaults.auth_method = "oauth"
     # fallback.model defaults to None
     assert _validate_auth(config, anthropic_oauth_creds) is None
 
 
-def test_fallback_wrong_auth_method_fails(anthropic_oauth_creds):
+def test_fallback_wrong_auth_method_fails(anthropic_oauth_creds, config):
     """Fallback model set but auth_method doesn't match credentials."""
-    config = Config()
     config.agents.defaults.auth_method = "oauth"
     config.agents.fallback.model = "gemini/gemini-3-pro-preview"
     config.agents.fallback.auth_method = "api_key"
@@ -69,7 +71,7 @@ def test_fallback_wrong_auth_method_fails(anthropic_oauth_creds):
     assert "gemini" in error.lower()
 
 
-def test_fallback_oauth_no_token_fails():
+def test_fallback_oauth_no_token_fails(config):
     """Fallback uses OAuth but no OAuth configured for that provider."""
     creds = Credentials(
         providers=ProvidersCredentials(
@@ -77,7 +79,6 @@ def test_fallback_oauth_no_token_fails():
             gemini=ProviderCredentials(api_key="gemini-key"),
         ),
     )
-    config = Config()
     config.agents.defaults.auth_method = "api_key"
     config.agents.fallback.model = "gemini/gemini-3-pro-preview"
     config.agents.fallback.auth_method = "oauth"
@@ -87,8 +88,7 @@ def test_fallback_oauth_no_token_fails():
     assert "Fallback model" in error
 
 
-def test_primary_invalid_auth_method():
-    config = Config()
+def test_primary_invalid_auth_method(config):
     config.agents.defaults.auth_method = "bearer"
     error = _validate_auth(config, Credentials())
     assert error is not None
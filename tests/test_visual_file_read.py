@@ -14,33 +14,51 @@ from ragnarbot.agent.tools.filesystem import (
     ReadFileTool,
     WriteFileTool,
 )
-from ragnarbot.session.manager import Session
+from ragnarbot.session import manager as session_manager
+from ragnarbot.session.manager import Session, _EncodedImageCache
+from ragnarbot.utils import helpers
 
 # -- Helpers ------------------------------------------------------------------
 
+# Minimal 1x1 white PNG (67 bytes)
+_PNG_BYTES = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAAC0lEQVQI12NgAAIABQAB"
+    "Nl7BcQAAAABJRU5ErkJggg=="
+)
+
+
 def _make_png(path: Path, size: int = 100) -> None:
     """Write a minimal valid PNG file."""
-    # Minimal 1x1 white PNG (67 bytes)
-    png_bytes = base64.b64decode(
-        "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAAC0lEQVQI12NgAAIABQAB"
-        "Nl7BcQAAAABJRU5ErkJggg=="
-    )
-    if size > len(png_bytes):
-        # Pad with trailing zeros (still valid enough for our purposes)
-        png_bytes = png_bytes + b"\x00" * (size - len(png_bytes))
-    path.write_bytes(png_bytes)
+    # Pad with trailing zeros (still valid enough for our purposes); ljust
+    # builds the padded copy in one allocation, or returns _PNG_BYTES as-is.
+    path.write_bytes(_PNG_BYTES.ljust(size, b"\x00"))
 
 
 # -- ReadFileTool tests -------------------------------------------------------
 
+@pytest.fixture(scope="module")
+def read_tool() -> ReadFileTool:
+    # ReadFileTool keeps no per-call state, so one instance serves every test.
+    return ReadFileTool()
+
+
+@pytest.fixture(params=["pybase64", "stdlib"])
+def b64_encoder(request, monkeypatch):
+    """Encode images once with pybase64 and once with the stdlib fallback."""
+    if request.param == "pybase64":
+        pytest.importorskip("pybase64")
+    else:
+        monkeypatch.setattr(helpers, "_b64encode", base64.b64encode)
+    return request.param
+
+
 class TestReadFileToolImages:
     @pytest.mark.asyncio
-    async def test_image_returns_multimodal_blocks(self, tmp_path):
+    async def test_image_returns_multimodal_blocks(self, read_tool, b64_encoder, tmp_path):
         img = tmp_path / "photo.png"
         _make_png(img)
 
-        tool = ReadFileTool()
-        result = await tool.execute(path=str(img))
+        result = await read_tool.execute(path=str(img))
 
         assert isinstance(result, list)
         assert len(result) == 2
@@ -49,6 +67,8 @@ class TestReadFileToolImages:
         img_block = result[0]
         assert img_block["type"] == "image_url"
         assert img_block["image_url"]["url"].startswith("data:image/png;base64,")
+        payload = img_block["image_url"]["url"].split(",", 1)[1]
+        assert base64.b64decode(payload) == img.read_bytes()
         assert img_block["_image_path"] == str(img.resolve())
         assert img_block["_mime_type"] == "image/png"
 
@@ -58,53 +78,53 @@ class TestReadFileToolImages:
         assert "photo.png" in text_block["text"]
 
     @pytest.mark.asyncio
-    async def test_text_file_returns_string(self, tmp_path):
+    async def test_text_file_returns_string(self, read_tool, tmp_path):
         txt = tmp_path / "readme.txt"
         txt.write_text("hello world")
 
-        tool = ReadFileTool()
-        result = await tool.execute(path=str(txt))
+        result = await read_tool.execute(path=str(txt))
 
         assert isinstance(result, str)
         assert result == "hello world"
 
     @pytest.mark.asyncio
-    async def test_all_image_extensions_detected(self, tmp_path):
-        tool = ReadFileTool()
-        for ext in IMAGE_EXTENSIONS:
-            img = tmp_path / f"test{ext}"
-            _make_png(img)
-            result = await tool.execute(path=str(img))
-            assert isinstance(result, list), f"Extension {ext} not detected as image"
+    @pytest.mark.parametrize("ext", sorted(IMAGE_EXTENSIONS))
+    async def test_all_image_extensions_detected(self, read_tool, tmp_path, ext):
+        img = tmp_path / f"test{ext}"
+        _make_png(img)
+
+        result = await read_tool.execute(path=str(img))
+
+        assert isinstance(result, list), f"Extension {ext} not detected as image"
 
     @pytest.mark.asyncio
-    async def test_svg_treated_as_text(self, tmp_path):
+    async def test_svg_treated_as_text(self, read_tool, tmp_path):
         svg = tmp_path / "icon.svg"
         svg.write_text('<svg xmlns="http://www.w3.org/2000/svg"></svg>')
 
-        tool = ReadFileTool()
-        result = await tool.execute(path=str(svg))
+        result = await read_tool.execute(path=str(svg))
 
         assert isinstance(result, str)
         assert "<svg" in result
 
     @pytest.mark.asyncio
-    async def test_large_image_rejected(self, tmp_path):
+    async def test_large_image_rejected(self, read_tool, tmp_path):
         img = tmp_path / "huge.jpg"
-        # Write a file just over the size limit
-        img.write_bytes(b"\xff\xd8\xff" + b"\x00" * (MAX_IMAGE_SIZE + 1))
+        # Sparse file just over the size limit: only the JPEG magic is written,
+        # the size check stats the file without reading it.
+        with open(img, "wb") as f:
+            f.write(b"\xff\xd8\xff")
+            f.truncate(MAX_IMAGE_SIZE + 4)
 
-        tool = ReadFileTool()
-        result = await tool.execute(path=str(img))
+        result = await read_tool.execute(path=str(img))
 
         assert isinstance(result, str)
         assert "exceeds" in result.lower()
         assert "size limit" in result.lower()
 
     @pytest.mark.asyncio
-    async def test_missing_file_error(self):
-        tool = ReadFileTool()
-        result = await tool.execute(path="/nonexistent/photo.png")
+    async def test_missing_file_error(self, read_tool):
+        result = await read_tool.execute(path="/nonexistent/photo.png")
 
         assert isinstance(result, str)
         assert "not found" in result.lower()
@@ -252,6 +272,61 @@ class TestSessionImagePersistence:
         assert isinstance(tool_msg["content"], str)
         assert "gone.png" in tool_msg["content"]
 
+    def test_get_history_reuses_encoding_until_file_changes(self, tmp_path, monkeypatch):
+        img = tmp_path / "photo.png"
+        _make_png(img)
+        session = Session(key="test", user_key="test:1")
+        session.messages.append({
+            "role": "tool",
+            "content": f"Image: {img} (0 KB)",
+            "tool_call_id": "tc_1",
+            "name": "file_read",
+            "image_refs": [{"path": str(img), "mime": "image/png"}],
+        })
+
+        def image_url() -> str:
+            return session.get_history()[0]["content"][0]["image_url"]["url"]
+
+        encoded = []
+
+        def counting_encode(data: bytes) -> str:
+            encoded.append(data)
+            return helpers.encode_base64(data)
+
+        monkeypatch.setattr(session_manager, "encode_base64", counting_encode)
+        session_manager._image_cache.clear()
+        first = image_url()
+        assert image_url() == first
+        assert len(encoded) == 1
+
+        _make_png(img, size=200)
+        updated = image_url()
+        assert updated != first
+        assert base64.b64decode(updated.split(",", 1)[1]) == img.read_bytes()
+
+    def test_image_cache_evicts_by_encoded_size(self, tmp_path):
+        paths = []
+        for i in range(3):
+            img = tmp_path / f"img{i}.png"
+            _make_png(img, size=300)  # 400 base64 characters
+            paths.append(img)
+        cache = _EncodedImageCache(max_bytes=1000)
+
+        def get(img: Path) -> str:
+            st = img.stat()
+            return cache.get(str(img), st.st_mtime_ns, st.st_size)
+
+        for img in paths:
+            get(img)
+        assert [key[0] for key in cache._entries] == [str(p) for p in paths[1:]]
+        assert cache._bytes == 800
+
+        # Anything larger than the whole budget is encoded but never kept
+        big = tmp_path / "big.png"
+        _make_png(big, size=1500)
+        get(big)
+        assert str(big) not in {key[0] for key in cache._entries}
+
 
 # -- Cache flush tests --------------------------------------------------------
 
@@ -315,9 +390,8 @@ class TestAnthropicMultimodalToolResult:
         content = tool_result_msg["content"]
         assert isinstance(content, list)
         # Should contain an image block and a text block
-        types = [b.get("type") for b in content]
-        assert "image" in types
-        assert "text" in types
+        assert any(b.get("type") == "image" for b in content)
+        assert any(b.get("type") == "text" for b in content)
 
 
 # -- LiteLLM sanitize tests ---------------------------------------------------
@@ -353,6 +427,18 @@ class TestLiteLLMSanitize:
 
         assert result[0]["content"] == "hello"
 
+    def test_passes_clean_messages_through_uncopied(self):
+        from ragnarbot.providers.litellm_provider import LiteLLMProvider
+
+        messages = [
+            {"role": "user", "content": "hello"},
+            {"role": "user", "content": [{"type": "text", "text": "hi"}]},
+            {"role": "assistant", "content": None},
+        ]
+        result = LiteLLMProvider._sanitize_messages(messages)
+
+        assert all(out is msg for out, msg in zip(result, messages))
+
 
 class TestReadFileWindowing:
     @pytest.mark.asyncio